@@ -0,0 +1,9 @@
+"""引擎和绘制的性能基准
+
+    python -m benchmarks                          运行全部基准
+    python -m benchmarks --json result.json       结果写成 JSON
+    python -m benchmarks --compare baseline.json  和保存的基准比较，变慢超过阈值时返回 1
+
+micro 组测单个热点函数在几种典型棋盘上的耗时，macro 组测无界面整局速度和
+SDL dummy 驱动下的整帧绘制时间。以后改动这些代码时，用这里的数字说明效果。
+"""
@@ -0,0 +1,137 @@
+"""运行基准，输出 JSON，或和保存的基准结果比较
+
+    python -m benchmarks [--group micro|macro] [-k 名称片段] [--quick]
+                         [--json 输出文件] [--compare 基准文件] [--threshold 0.10]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# 绘制基准不打开真实窗口，也不占用声卡
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from benchmarks.suite import BENCHMARKS  # noqa: E402
+
+FORMAT = 1
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def calibrate(func, min_time):
+    """把循环次数翻倍，直到一轮至少跑 min_time 秒"""
+    loops = 1
+    while True:
+        elapsed = func(loops)
+        if elapsed >= min_time:
+            return loops
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+
+def run_benchmark(bench, min_time, repeats):
+    loops = calibrate(bench.func, min_time)
+    times = [bench.func(loops) / loops for _ in range(repeats)]
+    median = statistics.median(times)
+    return {
+        'group': bench.group,
+        'unit': bench.unit,
+        'loops': loops,
+        'repeats': repeats,
+        'median': median,
+        'min': min(times),
+        'max': max(times),
+        'stdev': statistics.stdev(times) if repeats > 1 else 0.0,
+        'ops_per_sec': 1 / median,
+    }
+
+
+def metadata():
+    import pygame
+    return {
+        'format': FORMAT,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """逐项比较中位数，返回变慢超过阈值的基准名"""
+    regressions = []
+    print(f'\n{"benchmark":<44}{"baseline":>12}{"current":>12}{"change":>9}')
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f'{name:<44}{"-":>12}{format_time(result["median"]):>12}{"new":>9}')
+            continue
+        change = result['median'] / old['median'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f'{name:<44}{format_time(old["median"]):>12}{format_time(result["median"]):>12}'
+              f'{change:>+9.1%}{flag}')
+    missing = sorted(set(baseline) - set(results))
+    if missing:
+        print(f'基准文件中另有 {len(missing)} 项本次没有运行')
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='俄罗斯方块性能基准')
+    parser.add_argument('--group', choices=('micro', 'macro'), help='只运行一组')
+    parser.add_argument('-k', dest='pattern', help='只运行名称包含该片段的基准')
+    parser.add_argument('--quick', action='store_true', help='缩短每项的运行时间，结果噪声更大')
+    parser.add_argument('--json', dest='json_path', help='把结果写到 JSON 文件')
+    parser.add_argument('--compare', dest='baseline', help='和之前保存的 JSON 结果比较')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='中位数变慢超过该比例视为退化（默认 0.10）')
+    args = parser.parse_args(argv)
+
+    min_time, repeats = (0.02, 3) if args.quick else (0.1, 7)
+    selected = [bench for bench in BENCHMARKS
+                if (args.group is None or bench.group == args.group)
+                and (args.pattern is None or args.pattern in bench.name)]
+    if not selected:
+        print('没有匹配的基准')
+        return 2
+
+    results = {}
+    for bench in selected:
+        result = results[bench.name] = run_benchmark(bench, min_time, repeats)
+        print(f'{bench.name:<44}{format_time(result["median"]):>12} /{bench.unit:<6}'
+              f'{result["ops_per_sec"]:>14,.0f} {bench.unit}/s')
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'meta': metadata(), 'results': results}, f, indent=2)
+        print(f'结果已写入 {args.json_path}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f'{len(regressions)} 项变慢超过 {args.threshold:.0%}: {", ".join(regressions)}')
+            return 1
+        print(f'没有超过 {args.threshold:.0%} 的退化')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
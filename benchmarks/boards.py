@@ -0,0 +1,72 @@
+"""基准使用的典型棋盘，全部由固定种子生成，每次运行完全相同"""
+
+import random
+
+from engine.bitboard import Board
+from engine.rules import COLUMNS, ROWS
+from engine.zobrist import board_hash
+
+FULL_ROW = (1 << COLUMNS) - 1
+SEED = 2024
+
+
+def holed_rows(count, rng):
+    """count 行各留一个空格的行掩码"""
+    return [FULL_ROW & ~(1 << rng.randrange(COLUMNS)) for _ in range(count)]
+
+
+def jagged_rows(heights):
+    """按列高度堆成的实心地形"""
+    return [sum(1 << x for x, height in enumerate(heights) if ROWS - y <= height) for y in range(ROWS)]
+
+
+def _empty():
+    return [0] * ROWS
+
+
+def _half_full():
+    rng = random.Random(SEED)
+    return [0] * (ROWS // 2) + holed_rows(ROWS // 2, rng)
+
+
+def _jagged():
+    return jagged_rows([2, 9, 1, 12, 4, 15, 0, 8, 3, 11])
+
+
+def _near_death():
+    # 只留下出生区的三行
+    rng = random.Random(SEED + 1)
+    return [0] * 3 + holed_rows(ROWS - 3, rng)
+
+
+def _full_rows():
+    # 四个满行夹在有空洞的行之间，用于测消行
+    rng = random.Random(SEED + 2)
+    rows = [0] * 8 + holed_rows(ROWS - 8, rng)
+    for y in (11, 14, 15, 19):
+        rows[y] = FULL_ROW
+    return rows
+
+
+BOARDS = {
+    'empty': _empty,
+    'half_full': _half_full,
+    'jagged': _jagged,
+    'near_death': _near_death,
+}
+
+
+def make_board(rows):
+    """由行掩码列表构造 Board，颜色平面统一填 1"""
+    board = Board(COLUMNS, ROWS)
+    board.masks = list(rows)
+    board.cells = [[1 if mask >> x & 1 else None for x in range(COLUMNS)] for mask in rows]
+    board.hash = board_hash(rows, board.keys)
+    board.update_tops()
+    return board
+
+
+def board_rows(name):
+    if name == 'full_rows':
+        return _full_rows()
+    return BOARDS[name]()
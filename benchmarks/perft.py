@@ -0,0 +1,258 @@
+"""落点计数（perft）：从固定棋盘按固定方块序列展开 N 层，统计所有可达的固定位置
+
+借用国际象棋引擎的 perft：第 1 层是第一个方块所有不同的落点，每个落点固定、消行后
+再展开下一个方块，第 N 层的叶子总数和存好的参考值比较，同时给出每秒的叶子数。
+最后一层只数落点个数，不再固定。
+
+规则按 tetris.py：左移、右移、软降各走一格，原地旋转不踢墙，方块从出生位置开始，
+放不下去就不能再移动的位置就是落点，形状和位置都相同的落点只算一次。
+同一个计数用三种实现分别求出：
+    original  tetris_backup.py 的列表网格：valid_move 逐格搜索，lock_tetromino 写格子，clear_lines 重建网格
+    tetris    tetris.py 现在的 valid_move / lock_tetromino / clear_lines（位棋盘、预计算旋转表），同样逐格搜索
+    engine    engine.movegen 的位并行可达搜索，Board 的天际线和局部消行
+三者的计数必须一致；引擎做了新的优化时跑一遍，既检查正确性，也能看出比原始实现快了多少。
+
+命令行：
+    python -m benchmarks.perft [--depth N] [--impl original,tetris,engine] [--position 名称]
+
+参考值存到 4 层，更深时只比较各实现之间是否一致。
+只想测引擎时用 --impl engine，和参考值比较即可。计数不一致时返回 1。
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.boards import board_rows, make_board
+from benchmarks.suite import tetris_module
+from engine.movegen import Reachability
+from engine.pieces import PIECES
+from engine.rules import COLUMNS
+
+KINDS = 'IJLOSTZ'   # 方块字母，顺序和 rules.SHAPES 相同
+
+# (棋盘, 方块序列)，序列比层数短时循环使用
+POSITIONS = {
+    'empty': ('empty', 'TSZI'),
+    'half_full': ('half_full', 'LJOT'),
+    'jagged': ('jagged', 'ISZL'),
+    'near_death': ('near_death', 'OTIJ'),
+}
+
+# {(局面, 层数): 叶子数}，由 original 实现求出，三种实现核对过
+REFERENCE = {
+    ('empty', 1): 34, ('empty', 2): 589, ('empty', 3): 10491, ('empty', 4): 186983,
+    ('half_full', 1): 34, ('half_full', 2): 1174, ('half_full', 3): 11097, ('half_full', 4): 398367,
+    ('jagged', 1): 17, ('jagged', 2): 290, ('jagged', 3): 5244, ('jagged', 4): 171482,
+    ('near_death', 1): 9, ('near_death', 2): 119, ('near_death', 3): 573, ('near_death', 4): 2139,
+}
+DEPTH = 3   # 默认层数，original 每个局面几秒；4 层要几分钟
+
+_modules = {}
+
+
+def original_module():
+    """tetris_backup.py，改成位棋盘以前的列表网格实现"""
+    module = _modules.get('original')
+    if module is None:
+        import tetris_backup as module
+        _modules['original'] = module
+    return module
+
+
+# 每种实现提供 position(行掩码) 建起始棋盘、placements(棋盘, 方块) 列出落点、
+# play(棋盘, 方块, 落点) 固定落点并消行后返回新棋盘
+
+class _CellSearch:
+    """逐格广度优先搜索，每一步都调用一次 valid_move，子类提供方块的表示"""
+
+    def placements(self, grid, kind):
+        valid_move = self.module.valid_move
+        piece = self.spawn(kind)
+        if not valid_move(grid, piece, 0, 0):
+            return []
+        seen = {self.state(piece)}
+        queue = [piece]
+        landed = {}
+        for piece in queue:
+            moves = [self.moved(piece, dx, dy) for dx, dy in ((-1, 0), (1, 0), (0, 1))
+                     if valid_move(grid, piece, dx, dy)]
+            if not valid_move(grid, piece, 0, 1):
+                landed.setdefault(self.cells(piece), piece)
+            shape, turned = self.turned(piece)
+            if valid_move(grid, piece, 0, 0, shape):
+                moves.append(turned)
+            for child in moves:
+                state = self.state(child)
+                if state not in seen:
+                    seen.add(state)
+                    queue.append(child)
+        return list(landed.values())
+
+    def cells(self, piece):
+        return frozenset((piece.x + x, piece.y + y) for y, row in enumerate(piece.shape)
+                         for x, cell in enumerate(row) if cell)
+
+
+class OriginalRules(_CellSearch):
+    name = 'original'
+
+    def __init__(self):
+        self.module = original_module()
+
+    def position(self, rows):
+        return [[1 if mask >> x & 1 else None for x in range(COLUMNS)] for mask in rows]
+
+    def spawn(self, kind):
+        return self.module.Tetromino(self.module.SHAPES[kind], self.module.COLORS[kind])
+
+    def _copy(self, piece, shape, x, y):
+        copy = self.module.Tetromino(shape, piece.color)
+        copy.x = x
+        copy.y = y
+        return copy
+
+    def moved(self, piece, dx, dy):
+        return self._copy(piece, piece.shape, piece.x + dx, piece.y + dy)
+
+    def turned(self, piece):
+        turned = self._copy(piece, piece.shape, piece.x, piece.y)
+        turned.rotate()
+        return turned.shape, turned
+
+    def state(self, piece):
+        return tuple(map(tuple, piece.shape)), piece.x, piece.y
+
+    def play(self, grid, kind, piece):
+        grid = [row[:] for row in grid]
+        self.module.lock_tetromino(grid, piece)
+        grid, _ = self.module.clear_lines(grid)
+        return grid
+
+
+class TetrisRules(_CellSearch):
+    name = 'tetris'
+
+    def __init__(self):
+        self.module = tetris_module()
+
+    def position(self, rows):
+        return make_board(rows)
+
+    def spawn(self, kind):
+        return self.module.Tetromino(kind)
+
+    def moved(self, piece, dx, dy):
+        moved = piece.copy()
+        moved.x += dx
+        moved.y += dy
+        return moved
+
+    def turned(self, piece):
+        # valid_move 直接收旋转下标，从旋转表取掩码
+        turned = piece.copy()
+        turned.rotate()
+        return turned.rotation, turned
+
+    def state(self, piece):
+        # 和 original 按形状去重一致：O 的四个旋转、S/Z/I 的两对旋转形状相同，只算一个状态
+        return piece.masks, piece.x, piece.y
+
+    def play(self, grid, kind, piece):
+        grid = grid.copy()
+        self.module.lock_tetromino(grid, piece)
+        self.module.clear_lines(grid, piece)
+        return grid
+
+
+class EngineRules:
+    name = 'engine'
+
+    def position(self, rows):
+        return make_board(rows)
+
+    def placements(self, board, kind):
+        return Reachability(board, kind).placements
+
+    def play(self, board, kind, placement):
+        rotation, x, y = placement
+        data = PIECES[kind][rotation]
+        board = board.copy()
+        board.lock(data.masks, x, y, kind + 1)
+        board.clear_full_rows(y, y + data.height)
+        return board
+
+
+IMPLEMENTATIONS = {rules.name: rules for rules in (OriginalRules, TetrisRules, EngineRules)}
+
+
+def perft(rules, grid, kinds, depth):
+    """放完 kinds 的前 depth 个方块共有多少种不同的落点序列"""
+    kind = kinds[0]
+    found = rules.placements(grid, kind)
+    if depth == 1:
+        return len(found)
+    return sum(perft(rules, rules.play(grid, kind, placement), kinds[1:], depth - 1) for placement in found)
+
+
+def sequence(letters, depth):
+    """方块字母序列循环展开成 depth 个方块下标"""
+    return [KINDS.index(letters[i % len(letters)]) for i in range(depth)]
+
+
+def run(rules, name, depth):
+    """(叶子数, 秒)"""
+    board, letters = POSITIONS[name]
+    grid = rules.position(board_rows(board))
+    start = time.perf_counter()
+    count = perft(rules, grid, sequence(letters, depth), depth)
+    return count, time.perf_counter() - start
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.perft', description='落点计数（perft）')
+    parser.add_argument('--depth', type=int, default=DEPTH, help=f'展开的层数（默认 {DEPTH}）')
+    parser.add_argument('--impl', default=','.join(IMPLEMENTATIONS),
+                        help=f'逗号分隔的实现，可选 {", ".join(IMPLEMENTATIONS)}')
+    parser.add_argument('--position', choices=list(POSITIONS), help='只算一个局面')
+    args = parser.parse_args(argv)
+    impls = args.impl.split(',')
+    unknown = [name for name in impls if name not in IMPLEMENTATIONS]
+    if unknown:
+        parser.error(f'未知的实现: {", ".join(unknown)}')
+    names = [args.position] if args.position else list(POSITIONS)
+    depth = args.depth
+    impls = [IMPLEMENTATIONS[name]() for name in impls]
+
+    failed = False
+    for name in names:
+        board, letters = POSITIONS[name]
+        print(f'{name}（棋盘 {board}，方块 {letters}）')
+        for level in range(1, depth + 1):
+            expected = REFERENCE.get((name, level))
+            counts = set()
+            elapsed = {}
+            for rules in impls:
+                count, seconds = run(rules, name, level)
+                counts.add(count)
+                elapsed[rules.name] = seconds
+                if expected is None:
+                    status = ''
+                elif count == expected:
+                    status = 'ok'
+                else:
+                    status = f'错误，参考值 {expected:,}'
+                    failed = True
+                rate = count / seconds if seconds else 0.0
+                line = f'  {level} 层 {rules.name:<9}{count:>12,}{seconds * 1000:>11.1f} 毫秒{rate:>14,.0f} 落点/秒'
+                if 'original' in elapsed and rules.name != 'original' and seconds:
+                    line += f'{elapsed["original"] / seconds:>8.1f}x'
+                print(f'{line}  {status}'.rstrip())
+            if len(counts) > 1:
+                print(f'  {level} 层各实现的计数不一致: {sorted(counts)}')
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,287 @@
+"""基准定义
+
+每个基准是一个 func(loops) 函数，自己计时并返回执行 loops 次操作的秒数，
+这样准备数据（复制棋盘等）的时间不会算进去。
+"""
+
+import importlib.util
+import os
+import random
+import time
+
+from benchmarks.boards import BOARDS, board_rows, make_board
+from engine.bot import Bot, placements
+from engine.game_state import GameState
+from engine.movegen import Reachability, reachable
+from engine.pieces import CSDN_PIECES, Piece
+from engine.rules import CSDN_KICKS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSDN_DIR = os.path.join(ROOT, 'csdn')
+T_KIND = 5        # tetris.py 里 T 的下标
+CSDN_T_KIND = 2   # csdn 里 T 的下标
+BATCH = 100       # 会修改棋盘的基准每批预先准备的棋盘数
+
+
+class Benchmark:
+    __slots__ = ('group', 'name', 'unit', 'func')
+
+    def __init__(self, group, name, unit, func):
+        self.group = group
+        self.name = name
+        self.unit = unit
+        self.func = func
+
+
+BENCHMARKS = []
+
+
+def benchmark(group, name, unit='call'):
+    """注册一个基准"""
+    def register(func):
+        BENCHMARKS.append(Benchmark(group, f'{group}.{name}', unit, func))
+        return func
+    return register
+
+
+def timed_loop(loops, call, *args):
+    start = time.perf_counter()
+    for _ in range(loops):
+        call(*args)
+    return time.perf_counter() - start
+
+
+def timed_batches(loops, prepare, body):
+    """body 会修改输入时使用：每批先准备好 BATCH 份输入，只对 body 计时"""
+    elapsed = 0.0
+    while loops > 0:
+        count = min(BATCH, loops)
+        items = [prepare() for _ in range(count)]
+        start = time.perf_counter()
+        for item in items:
+            body(item)
+        elapsed += time.perf_counter() - start
+        loops -= count
+    return elapsed
+
+
+# ---- 前端模块按需加载，只跑 micro 组时不需要显示设备 ----
+
+_modules = {}
+
+
+def tetris_module():
+    module = _modules.get('tetris')
+    if module is None:
+        import tetris as module
+        if not os.path.exists(module.FONT_PATH):
+            # 仓库里没有附带字体文件时用 pygame 默认字体
+            module.FONT_PATH = None
+        _modules['tetris'] = module
+    return module
+
+
+def csdn_game():
+    """csdn/main.py 的 Tetris 对象；它在当前目录下读取音效和最高分文件"""
+    game = _modules.get('csdn')
+    if game is None:
+        spec = importlib.util.spec_from_file_location('csdn_main', os.path.join(CSDN_DIR, 'main.py'))
+        module = importlib.util.module_from_spec(spec)
+        cwd = os.getcwd()
+        os.chdir(CSDN_DIR)
+        try:
+            spec.loader.exec_module(module)
+            game = _modules['csdn'] = module.Tetris()
+        finally:
+            os.chdir(cwd)
+    return game
+
+
+# ---- micro：tetris.py ----
+
+def _tetris_board_benchmarks(name, make_rows):
+    @benchmark('micro', f'tetris.valid_move[{name}]')
+    def valid_move(loops):
+        tetris = tetris_module()
+        grid = make_board(make_rows())
+        piece = tetris.Tetromino(T_KIND)
+        return timed_loop(loops, tetris.valid_move, grid, piece, 0, 1)
+
+    @benchmark('micro', f'tetris.get_shadow_y[{name}]')
+    def get_shadow_y(loops):
+        tetris = tetris_module()
+        grid = make_board(make_rows())
+        piece = tetris.Tetromino(T_KIND)
+        return timed_loop(loops, tetris.get_shadow_y, grid, piece)
+
+    @benchmark('micro', f'tetris.lock_tetromino[{name}]')
+    def lock_tetromino(loops):
+        tetris = tetris_module()
+        rows = make_rows()
+        piece = tetris.Tetromino(T_KIND)
+        piece.y = tetris.get_shadow_y(make_board(rows), piece)
+        return timed_batches(loops, lambda: make_board(rows),
+                             lambda grid: tetris.lock_tetromino(grid, piece))
+
+    @benchmark('micro', f'tetris.clear_lines[{name}]')
+    def clear_lines(loops):
+        tetris = tetris_module()
+        rows = make_rows()
+        return timed_batches(loops, lambda: make_board(rows), tetris.clear_lines)
+
+
+def _csdn_board_benchmarks(name, make_rows):
+    @benchmark('micro', f'csdn.check_collision[{name}]')
+    def check_collision(loops):
+        game = csdn_game()
+        game.state.board = make_board(make_rows())
+        piece = Piece(CSDN_T_KIND, table=CSDN_PIECES)
+        return timed_loop(loops, game.check_collision, piece, 0, 1)
+
+    @benchmark('micro', f'csdn.get_ghost_piece[{name}]')
+    def get_ghost_piece(loops):
+        game = csdn_game()
+        game.state.board = make_board(make_rows())
+        game.state.current = Piece(CSDN_T_KIND, table=CSDN_PIECES)
+        return timed_loop(loops, game.get_ghost_piece)
+
+
+for _name, _make_rows in BOARDS.items():
+    _tetris_board_benchmarks(_name, _make_rows)
+
+# 棋盘中有满行时才会真正搬动行
+benchmark('micro', 'tetris.clear_lines[full_rows]')(
+    lambda loops: timed_batches(loops, lambda: make_board(board_rows('full_rows')),
+                                tetris_module().clear_lines))
+
+
+@benchmark('micro', 'tetris.Tetromino.rotate')
+def rotate(loops):
+    tetris = tetris_module()
+    return timed_loop(loops, tetris.Tetromino(T_KIND).rotate)
+
+
+for _name, _make_rows in BOARDS.items():
+    _csdn_board_benchmarks(_name, _make_rows)
+
+
+def _movegen_benchmarks(name, make_rows):
+    # 从顶上直接落下的枚举和按真实操作搜索的可达落点对比
+    @benchmark('micro', f'bot.placements[{name}]')
+    def drop_placements(loops):
+        board = make_board(make_rows())
+        return timed_loop(loops, lambda: list(placements(board, T_KIND)))
+
+    @benchmark('micro', f'movegen.Reachability[{name}]')
+    def reachable_only(loops):
+        board = make_board(make_rows())
+        return timed_loop(loops, Reachability, board, CSDN_T_KIND, 0, None, 0, CSDN_PIECES, CSDN_KICKS)
+
+    # 包括每个落点的操作路径
+    @benchmark('micro', f'movegen.reachable[{name}]')
+    def reachable_paths(loops):
+        board = make_board(make_rows())
+        return timed_loop(loops, reachable, board, CSDN_T_KIND, 0, None, 0, CSDN_PIECES, CSDN_KICKS)
+
+
+for _name, _make_rows in BOARDS.items():
+    _movegen_benchmarks(_name, _make_rows)
+
+
+# ---- macro：落点计数 ----
+
+def _perft_benchmark(name):
+    # 2 层的完整展开，计数的正确性由 python -m benchmarks.perft 检查
+    @benchmark('macro', f'perft.engine[{name}]')
+    def perft_engine(loops):
+        from benchmarks.perft import EngineRules, run
+        rules = EngineRules()
+        return sum(run(rules, name, 2)[1] for _ in range(loops))
+
+
+for _name in BOARDS:
+    _perft_benchmark(_name)
+
+
+# ---- macro：整局 ----
+
+@benchmark('macro', 'games.random', unit='game')
+def random_games(loops):
+    """随机落点玩完整局，主要测 GameState 的开销"""
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for seed in range(loops):
+        state = GameState(seed)
+        while not state.game_over:
+            state.place(rng.randrange(4), rng.randrange(8))
+    return time.perf_counter() - start
+
+
+@benchmark('macro', 'games.bot', unit='piece')
+def bot_pieces(loops):
+    """自动玩家每放一块的耗时，死局后换种子继续"""
+    state = GameState(0)
+    bot = Bot()
+    start = time.perf_counter()
+    for _ in range(loops):
+        if state.game_over:
+            state.reset(state.seed + 1)
+        bot.play(state)
+    return time.perf_counter() - start
+
+
+# ---- macro：整帧绘制，需要 SDL dummy 驱动 ----
+
+def midgame_state(seed=7):
+    state = GameState(seed)
+    state.board = make_board(board_rows('half_full'))
+    return state
+
+
+@benchmark('macro', 'render.tetris_full', unit='frame')
+def render_tetris_full(loops):
+    import pygame
+    tetris = tetris_module()
+    pygame.init()
+    screen = pygame.display.set_mode((tetris.WINDOW_WIDTH, tetris.WINDOW_HEIGHT))
+    state = midgame_state()
+    start = time.perf_counter()
+    for _ in range(loops):
+        tetris.draw_frame(screen, state)
+        pygame.display.flip()
+    return time.perf_counter() - start
+
+
+@benchmark('macro', 'render.tetris_dirty', unit='frame')
+def render_tetris_dirty(loops):
+    """方块每帧左右移动一格时的脏矩形绘制"""
+    import pygame
+    tetris = tetris_module()
+    pygame.init()
+    screen = pygame.display.set_mode((tetris.WINDOW_WIDTH, tetris.WINDOW_HEIGHT))
+    renderer = tetris.PlayfieldRenderer(tetris.COLUMNS, tetris.ROWS, tetris.GRID_SIZE, tetris.COLORS,
+                                        tetris.BG_COLOR, tetris.GRID_COLOR, tetris.SHADOW_ALPHA,
+                                        atlas=tetris.ATLAS)
+    state = midgame_state()
+    shown = {}
+    tetris.draw_changes(screen, renderer, state, shown)
+    x = state.current.x
+    start = time.perf_counter()
+    for i in range(loops):
+        state.current.x = x + (i & 1)
+        rects = tetris.draw_changes(screen, renderer, state, shown)
+        pygame.display.update(rects)
+    return time.perf_counter() - start
+
+
+@benchmark('macro', 'render.csdn_full', unit='frame')
+def render_csdn_full(loops):
+    import pygame
+    game = csdn_game()
+    game.open_window()
+    game.state.board = make_board(board_rows('half_full'))
+    start = time.perf_counter()
+    for _ in range(loops):
+        game.draw()
+        pygame.display.flip()
+    return time.perf_counter() - start
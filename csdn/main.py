@@ -1,66 +1,27 @@
-import pygame
-import random
 import json
+import os
+import sys
 from datetime import datetime
-import numpy as np
-from scipy.io import wavfile
-import wave
- 
-# 通用参数
-sample_rate = 44100  # 采样率
-duration = 0.15      # 音效时长（秒）
-volume = 0.3         # 音量
- 
-def generate_move_sound():
-    """生成移动音效（短促方波）"""
-    t = np.linspace(0, duration, int(sample_rate * duration))
-    freq = 800
-    wave = np.sign(np.sin(2 * np.pi * freq * t))
-    data = (wave * volume * 32767).astype(np.int16)
-    wavfile.write('move.wav', sample_rate, data)
- 
-def generate_rotate_sound():
-    """生成旋转音效（正弦波滑音）"""
-    t = np.linspace(0, duration, int(sample_rate * duration))
-    freq_start = 1200
-    freq_end = 800
-    freq = np.linspace(freq_start, freq_end, len(t))
-    wave = np.sin(2 * np.pi * np.cumsum(freq) / sample_rate)
-    data = (wave * volume * 32767).astype(np.int16)
-    wavfile.write('rotate.wav', sample_rate, data)
- 
-def generate_clear_sound():
-    """生成消除音效（和弦）"""
-    t = np.linspace(0, 0.4, int(sample_rate * 0.4))
-    wave = (
-        np.sin(2 * np.pi * 440 * t) + 
-        np.sin(2 * np.pi * 880 * t) + 
-        np.sin(2 * np.pi * 1320 * t)
-    ) / 3
-    data = (wave * volume * 32767).astype(np.int16)
-    wavfile.write('clear.wav', sample_rate, data)
- 
-def generate_game_over_sound():
-    """生成游戏结束音效（低频脉冲）"""
-    t = np.linspace(0, 1.0, int(sample_rate * 1.0))
-    freq = 220 * (1 - t)  # 频率逐渐降低
-    wave = np.sin(2 * np.pi * np.cumsum(freq) / sample_rate)
-    wave *= np.exp(-3 * t)  # 指数衰减
-    data = (wave * volume * 32767).astype(np.int16)
-    wavfile.write('game_over.wav', sample_rate, data)
- 
-# 生成所有音效
-if __name__ == "__main__":
-    generate_move_sound()
-    generate_rotate_sound()
-    generate_clear_sound()
-    generate_game_over_sound()
-    print("音效文件已生成：move.wav, rotate.wav, clear.wav, game_over.wav")
- 
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from frontend.startup import STARTUP, lazy_import
+# pygame (and the numpy it pulls in) is only imported on first use, so tools that just
+# import this module - the bot, replays, benchmarks - start in milliseconds
+pygame = lazy_import('pygame')
+from engine.bot import BotDriver
+from engine.game_state import new_game, StepResult, LEFT, RIGHT, ROTATE, SOFT_DROP, HARD_DROP, PAUSE
+from engine.planner import BeamBot
+from engine.replay import Recorder
+from frontend.audio import AudioManager
+from frontend.input import KeyRepeat
+from frontend.pcm_cache import PCMCache
+from frontend.profiler import FrameProfiler, NO_PROFILER
+from frontend.resources import FONTS
+from frontend.sprites import BlockAtlas
+from frontend.synth import MAX_LEVEL, SoundBank, export_wav
+from frontend.timestep import FixedTimestep
  
 # 初始化配置
-pygame.init()
-pygame.mixer.init()
 BLOCK_SIZE = 30
 GRID_PADDING = 1
 GAME_WIDTH = 10
@@ -68,6 +29,7 @@ GAME_HEIGHT = 20
 SCREEN_WIDTH = BLOCK_SIZE * (GAME_WIDTH + 8)
 SCREEN_HEIGHT = BLOCK_SIZE * GAME_HEIGHT
 FPS = 60
+GHOST_ALPHA = 100
  
 COLORS = [
     (40, 40, 40),        # 背景
@@ -82,16 +44,6 @@ COLORS = [
     (200, 200, 200)      # 网格线颜色
 ]
  
-SHAPES = [
-    [[1, 1, 1, 1]],       # I
-    [[1, 1], [1, 1]],     # O
-    [[1, 1, 1], [0, 1, 0]], # T
-    [[1, 1, 1], [1, 0, 0]], # L
-    [[1, 1, 1], [0, 0, 1]], # J
-    [[1, 1, 0], [0, 1, 1]], # S
-    [[0, 1, 1], [1, 1, 0]]  # Z
-]
- 
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color):
         self.rect = pygame.Rect(x, y, width, height)
@@ -105,8 +57,7 @@ class Button:
         color = self.hover_color if self.hovered else self.color
         pygame.draw.rect(screen, color, self.rect)
         
-        font = pygame.font.SysFont(None, 24)
-        text_surface = font.render(self.text, True, (255, 255, 255))
+        text_surface = FONTS.render(self.text, 24, (255, 255, 255), system=True)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
  
@@ -116,19 +67,33 @@ class Button:
  
 class Tetris:
     def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Tetris")
+        # Display and fonts are initialised here instead of at import time;
+        # the mixer is initialised by the audio thread after the first frame
+        pygame.display.init()
+        pygame.font.init()
+        
+        # 窗口在 run() 中才创建，构造游戏对象不需要显示设备
+        self.screen = None
         self.clock = pygame.time.Clock()
         
-        # Load sounds
-        self.move_sound = pygame.mixer.Sound('move.wav')
-        self.rotate_sound = pygame.mixer.Sound('rotate.wav')
-        self.clear_sound = pygame.mixer.Sound('clear.wav')
-        self.game_over_sound = pygame.mixer.Sound('game_over.wav')
+        # Pre-rendered block surfaces for every (color, alpha, preview) combination
+        self.atlas = BlockAtlas(COLORS, BLOCK_SIZE - GRID_PADDING * 2).prebuild(alphas=(255, GHOST_ALPHA))
+        
+        # All sound variants are synthesized in one batch on a background thread once
+        # the first frame is shown; later launches map the cached PCM instead
+        self.audio = AudioManager(banks=[SoundBank(PCMCache(), prefix='csdn')])
         
         # Initialize game state
         self.high_score = 0
-        self.score = 0
+        self.state = new_game('csdn')
+        # Bot looks ahead at the preview piece within an 8 ms budget per move
+        self.bot = BotDriver(BeamBot())
+        self.recorder = Recorder.from_argv(sys.argv, self.state, 'csdn')
+        
+        # Frame phase timings: --profile / --profile-dump=FILE, F3 toggles
+        self.profiler = FrameProfiler.from_argv(sys.argv)
+        # Fixed 60 Hz logic: --fps=N caps rendering (0 = uncapped), --speed=X fast-forwards, F cycles speed
+        self.timestep = FixedTimestep.from_argv(sys.argv)
         self.load_high_score()
         
         # Create control buttons
@@ -141,18 +106,48 @@ class Tetris:
             Button(panel_x + 20, 320, button_width, button_height, "Rotate", COLORS[7], COLORS[8]),
             Button(panel_x + 20, 380, button_width, button_height, "Drop", COLORS[7], COLORS[8])
         ]
+        # Profiler overlay sits at the bottom of the side panel, below the buttons
+        self.profiler_rect = pygame.Rect(panel_x, SCREEN_HEIGHT - 170, SCREEN_WIDTH - panel_x, 170)
         
-        # Key states tracking
-        self.key_states = {
-            pygame.K_LEFT: {'pressed': False, 'last_time': 0},
-            pygame.K_RIGHT: {'pressed': False, 'last_time': 0},
-            pygame.K_DOWN: {'pressed': False, 'last_time': 0}
-        }
-        self.repeat_delay = 200  # Initial delay
-        self.repeat_interval = 50  # Repeat interval
+        # Held keys auto-repeat on a monotonic clock: --das=MS initial delay (200), --arr=MS interval (50),
+        # --input-stats prints input-to-screen latency on exit
+        self.key_repeat = KeyRepeat.from_argv(sys.argv, {
+            pygame.K_LEFT: LEFT,
+            pygame.K_RIGHT: RIGHT,
+            pygame.K_DOWN: SOFT_DROP,
+        })
         
         self.reset_game()
  
+    @property
+    def score(self):
+        return self.state.score
+ 
+    @property
+    def level(self):
+        return 1 + self.state.score // 500
+ 
+    @property
+    def paused(self):
+        return self.state.paused
+ 
+    @property
+    def game_over_flag(self):
+        return self.state.game_over
+ 
+    @property
+    def current_piece(self):
+        return self.state.current
+ 
+    @property
+    def next_piece(self):
+        return self.state.next
+ 
+    def open_window(self):
+        """Create display window"""
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Tetris")
+ 
     def load_high_score(self):
         """Load high score from file"""
         try:
@@ -174,189 +169,81 @@ class Tetris:
  
     def reset_game(self):
         """Reset game state"""
-        self.game_field = [[0] * GAME_WIDTH for _ in range(GAME_HEIGHT)]
-        self.score = 0
-        self.level = 1
-        self.current_piece = None
-        self.next_piece = None
-        self.paused = False
-        self.game_over_flag = False
+        self.state.reset()
         self.start_time = datetime.now()
-        self.new_piece()
- 
-    def create_new_piece(self):
-        """Create new tetromino"""
-        shape = random.choice(SHAPES)
-        x = GAME_WIDTH // 2 - len(shape[0]) // 2
-        return {
-            'shape': shape,
-            'color': random.randint(1, len(COLORS)-2),
-            'x': x,
-            'y': 0
-        }
- 
-    def new_piece(self):
-        """Generate new piece"""
-        self.current_piece = self.next_piece if self.next_piece else self.create_new_piece()
-        self.next_piece = self.create_new_piece()
-        
-        if self.check_collision(self.current_piece):
-            self.game_over_sound.play()
-            self.game_over_flag = True
+ 
+    def handle_result(self, result):
+        """Play sounds for game events"""
+        # Move/rotate pitch rises with the level, the clear chord grows with the line count
+        level = min(self.level, MAX_LEVEL)
+        if result.moved:
+            self.audio.play(('move', level))
+        if result.rotated:
+            self.audio.play(('rotate', level))
+        # As in the original, only scored clears play the sound: hard drops clear silently
+        if result.score_delta:
+            self.audio.play(('clear', min(result.lines_cleared, 4)))
+        if result.game_over:
+            self.audio.play(('game_over', 0))
             self.save_high_score()
+        return result
  
     def check_collision(self, piece, dx=0, dy=0):
         """Collision detection"""
-        shape = piece['shape']
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    new_x = piece['x'] + x + dx
-                    new_y = piece['y'] + y + dy
-                    if new_x < 0 or new_x >= GAME_WIDTH:
-                        return True
-                    if new_y >= GAME_HEIGHT:
-                        return True
-                    if new_y >= 0 and self.game_field[new_y][new_x]:
-                        return True
-        return False
+        return self.state.collides(piece, dx, dy)
  
     def rotate_piece(self):
         """Rotate piece with wall kicks"""
-        if self.game_over_flag or self.paused:
-            return
-        
-        original_piece = {
-            'shape': [row[:] for row in self.current_piece['shape']],
-            'x': self.current_piece['x'],
-            'y': self.current_piece['y'],
-            'color': self.current_piece['color']
-        }
-        
-        new_shape = [list(row) for row in zip(*original_piece['shape'][::-1])]
-        self.current_piece['shape'] = new_shape
-        
-        wall_kicks = [(0, 0), (-1, 0), (1, 0), (0, -1), (-2, 0), (2, 0)]
-        for dx, dy in wall_kicks:
-            if not self.check_collision(self.current_piece, dx, dy):
-                self.current_piece['x'] += dx
-                self.current_piece['y'] += dy
-                self.rotate_sound.play()
-                return
-        
-        self.current_piece['shape'] = original_piece['shape']
+        self.handle_result(self.state.step(ROTATE))
  
     def move(self, dx):
         """Move piece horizontally"""
-        if self.game_over_flag or self.paused:
-            return
-        if not self.check_collision(self.current_piece, dx, 0):
-            self.current_piece['x'] += dx
-            self.move_sound.play()
+        self.handle_result(self.state.step(LEFT if dx < 0 else RIGHT))
  
     def drop(self):
         """Soft drop"""
-        if self.game_over_flag or self.paused:
-            return False
-        if not self.check_collision(self.current_piece, 0, 1):
-            self.current_piece['y'] += 1
-            return True
-        
-        self.merge_piece()
-        lines = self.clear_lines()
-        if lines > 0:
-            self.score += lines * 100
-            self.level = 1 + self.score // 500
-            self.clear_sound.play()
-        self.new_piece()
-        return False
+        result = self.handle_result(self.state.step(SOFT_DROP))
+        return not result.locked and not self.paused and not self.game_over_flag
  
     def hard_drop(self):
         """Hard drop"""
-        if self.game_over_flag or self.paused:
-            return
-        while not self.check_collision(self.current_piece, 0, 1):
-            self.current_piece['y'] += 1
-        self.merge_piece()
-        self.clear_lines()
-        self.new_piece()
- 
-    def merge_piece(self):
-        """Merge piece to game field"""
-        shape = self.current_piece['shape']
-        color = self.current_piece['color']
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    gy = y + self.current_piece['y']
-                    gx = x + self.current_piece['x']
-                    if 0 <= gy < GAME_HEIGHT and 0 <= gx < GAME_WIDTH:
-                        self.game_field[gy][gx] = color
- 
-    def clear_lines(self):
-        """Clear completed lines"""
-        lines_cleared = 0
-        new_field = []
-        for row in self.game_field:
-            if 0 not in row:
-                lines_cleared += 1
-            else:
-                new_field.append(row)
-        self.game_field = [[0]*GAME_WIDTH for _ in range(lines_cleared)] + new_field
-        return lines_cleared
+        self.handle_result(self.state.step(HARD_DROP))
  
     def get_ghost_piece(self):
         """Get ghost piece position"""
-        ghost = {
-            'shape': [row[:] for row in self.current_piece['shape']],
-            'x': self.current_piece['x'],
-            'y': self.current_piece['y'],
-            'color': self.current_piece['color']
-        }
-        while not self.check_collision(ghost, 0, 1):
-            ghost['y'] += 1
+        ghost = self.current_piece.copy()
+        ghost.y = self.state.drop_y()
         return ghost
  
     def draw_block(self, x, y, color, alpha=255, is_preview=False):
         """Draw single block"""
         if color == 0:
             return
-        rect_size = BLOCK_SIZE - GRID_PADDING * 2
         pos_x = x * BLOCK_SIZE + GRID_PADDING
         pos_y = y * BLOCK_SIZE + GRID_PADDING
         pygame.draw.rect(self.screen, COLORS[9], (x*BLOCK_SIZE, y*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE), 1)
-        surface = pygame.Surface((rect_size, rect_size))
-        surface.set_alpha(alpha)
-        base_color = list(COLORS[color])
-        if is_preview:
-            base_color = [min(c+50, 255) for c in base_color]
-        surface.fill(base_color)
-        self.screen.blit(surface, (pos_x, pos_y))
+        self.screen.blit(self.atlas.block(color, alpha, is_preview), (pos_x, pos_y))
  
     def draw_piece(self, piece, alpha=255, is_preview=False):
         """Draw current piece"""
-        for y, row in enumerate(piece['shape']):
-            for x, cell in enumerate(row):
-                if cell:
-                    self.draw_block(
-                        x + piece['x'],
-                        y + piece['y'],
-                        piece['color'],
-                        alpha,
-                        is_preview=is_preview
-                    )
+        for x, y in piece.cells:
+            self.draw_block(
+                x + piece.x,
+                y + piece.y,
+                piece.kind + 1,
+                alpha,
+                is_preview=is_preview
+            )
  
     def draw_sidebar(self):
         """Draw right panel"""
         panel_x = GAME_WIDTH * BLOCK_SIZE
         pygame.draw.rect(self.screen, COLORS[8], (panel_x, 0, SCREEN_WIDTH-panel_x, SCREEN_HEIGHT))
         
-        font = pygame.font.SysFont(None, 24)
-        
         # Score info
-        high_score_text = font.render(f"High Score: {self.high_score}", True, COLORS[7])
-        current_score_text = font.render(f"Score: {self.score}", True, COLORS[7])
-        level_text = font.render(f"Level: {self.level}", True, COLORS[7])
+        high_score_text = FONTS.render(f"High Score: {self.high_score}", 24, COLORS[7], system=True)
+        current_score_text = FONTS.render(f"Score: {self.score}", 24, COLORS[7], system=True)
+        level_text = FONTS.render(f"Level: {self.level}", 24, COLORS[7], system=True)
         
         self.screen.blit(high_score_text, (panel_x + 10, 20))
         self.screen.blit(current_score_text, (panel_x + 10, 60))
@@ -369,32 +256,52 @@ class Tetris:
         # Next piece preview
         preview_x = GAME_WIDTH + 2
         preview_y = 5
-        for y, row in enumerate(self.next_piece['shape']):
-            for x, cell in enumerate(row):
-                if cell:
-                    self.draw_block(
-                        preview_x + x,
-                        preview_y + y,
-                        self.next_piece['color'],
-                        is_preview=True
-                    )
+        for x, y in self.next_piece.cells:
+            self.draw_block(
+                preview_x + x,
+                preview_y + y,
+                self.next_piece.kind + 1,
+                is_preview=True
+            )
  
     def draw_game_over(self):
         """Game over screen"""
-        font = pygame.font.SysFont(None, 48, bold=True)
-        text = font.render("Game Over", True, (255, 0, 0))
+        text = FONTS.render("Game Over", 48, (255, 0, 0), bold=True, system=True)
         self.screen.blit(text, (BLOCK_SIZE*3, SCREEN_HEIGHT//2 - 48))
         
-        font_small = pygame.font.SysFont(None, 24)
-        text_score = font_small.render(f"Final Score: {self.score}", True, (255, 255, 255))
+        text_score = FONTS.render(f"Final Score: {self.score}", 24, (255, 255, 255), system=True)
         self.screen.blit(text_score, (BLOCK_SIZE*3, SCREEN_HEIGHT//2))
         
-        text_restart = font_small.render("Press R to restart", True, (200, 200, 200))
+        text_restart = FONTS.render("Press R to restart", 24, (200, 200, 200), system=True)
         self.screen.blit(text_restart, (BLOCK_SIZE*3, SCREEN_HEIGHT//2 + 40))
  
+    def draw(self, profiler=NO_PROFILER):
+        """Draw one full frame"""
+        self.screen.fill(COLORS[0])
+        
+        # Game field
+        with profiler.phase('draw_field'):
+            board = self.state.board
+            for y in range(GAME_HEIGHT):
+                for x in range(GAME_WIDTH):
+                    self.draw_block(x, y, board[y][x] or 0)
+        
+        if self.current_piece and not self.game_over_flag:
+            with profiler.phase('draw_ghost'):
+                ghost = self.get_ghost_piece()
+                self.draw_piece(ghost, alpha=GHOST_ALPHA)
+            with profiler.phase('draw_piece'):
+                self.draw_piece(self.current_piece)
+        
+        with profiler.phase('draw_sidebar'):
+            self.draw_sidebar()
+        
+        if self.game_over_flag:
+            with profiler.phase('draw_game_over'):
+                self.draw_game_over()
+ 
     def handle_input(self):
         """Handle input events"""
-        current_time = pygame.time.get_ticks()
         mouse_pos = pygame.mouse.get_pos()
         
         # Update button states
@@ -419,82 +326,91 @@ class Tetris:
             # Keyboard events
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_p:
-                    self.paused = not self.paused
+                    if self.game_over_flag:
+                        # GameState ignores PAUSE after game over, the original still toggled it
+                        self.state.paused = not self.state.paused
+                    else:
+                        self.state.step(PAUSE)
                 elif event.key == pygame.K_UP:
                     self.rotate_piece()
                 elif event.key == pygame.K_SPACE:
                     self.hard_drop()
+                elif event.key == pygame.K_b:
+                    self.bot.toggle()
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                elif event.key == pygame.K_f:
+                    self.timestep.cycle_speed()
                 elif event.key == pygame.K_r and self.game_over_flag:
                     self.reset_game()
-                elif event.key in self.key_states:
-                    self.key_states[event.key]['pressed'] = True
-                    self.key_states[event.key]['last_time'] = current_time
-                    # Immediate response
-                    if event.key == pygame.K_LEFT:
-                        self.move(-1)
-                    elif event.key == pygame.K_RIGHT:
-                        self.move(1)
-                    elif event.key == pygame.K_DOWN:
-                        self.drop()
+                else:
+                    # Immediate response, repeats are scheduled from this moment
+                    action = self.key_repeat.press(event.key)
+                    if action:
+                        self.handle_result(self.state.step(action))
             elif event.type == pygame.KEYUP:
-                if event.key in self.key_states:
-                    self.key_states[event.key]['pressed'] = False
- 
-        # Continuous movement
-        for key in [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_DOWN]:
-            if self.key_states[key]['pressed']:
-                time_diff = current_time - self.key_states[key]['last_time']
-                if time_diff > self.repeat_delay:
-                    interval = self.repeat_interval if time_diff > self.repeat_delay + self.repeat_interval else self.repeat_delay
-                    if (time_diff - self.repeat_delay) % interval < 15:  # ~60fps check
-                        if key == pygame.K_LEFT:
-                            self.move(-1)
-                        elif key == pygame.K_RIGHT:
-                            self.move(1)
-                        elif key == pygame.K_DOWN:
-                            self.drop()
+                self.key_repeat.release(event.key)
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                self.key_repeat.release_all()
+        # Repeats run after this frame's presses and releases, in time order,
+        # so a key released this frame does not move the piece once more
+        for _, action in self.key_repeat.due():
+            self.handle_result(self.state.step(action))
         return True
  
     def run(self):
         """Main game loop"""
-        fall_time = 0
+        STARTUP.mark('imports')
+        self.open_window()
+        STARTUP.mark('window')
         running = True
         
+        profiler = self.profiler
+        
         while running:
-            delta_time = self.clock.tick(FPS)
-            self.screen.fill(COLORS[0])
+            self.clock.tick(self.timestep.render_fps)
             
             # Handle input
-            running = self.handle_input()
-            
-            if not self.paused and not self.game_over_flag:
-                # Auto-drop logic
-                fall_speed = max(50, 500 - self.score//10)
-                fall_time += delta_time
-                if fall_time >= fall_speed:
-                    fall_time = 0
-                    self.drop()
- 
-            # Draw game elements
-            for y in range(GAME_HEIGHT):
-                for x in range(GAME_WIDTH):
-                    self.draw_block(x, y, self.game_field[y][x])
-            
-            if self.current_piece and not self.game_over_flag:
-                ghost = self.get_ghost_piece()
-                self.draw_piece(ghost, alpha=100)
-                self.draw_piece(self.current_piece)
+            with profiler.phase('events'):
+                running = self.handle_input()
             
-            self.draw_sidebar()
+            with profiler.phase('logic'):
+                # Run as many fixed logic ticks as real time (times the speed) allows
+                events = StepResult()
+                for _ in range(self.timestep.advance()):
+                    # Bot plays
+                    result = self.bot.update(self.state)
+                    if result:
+                        events.merge(result)
+                    
+                    # Auto-drop logic, faster as score grows
+                    result = self.state.tick()
+                    self.bot.notify(result)
+                    events.merge(result)
+                self.handle_result(events)
+ 
+            self.draw(profiler)
             
-            if self.game_over_flag:
-                self.draw_game_over()
+            profiler.draw_overlay(self.screen, self.profiler_rect)
+            with profiler.phase('flip'):
+                pygame.display.flip()
+            self.key_repeat.shown()
+            profiler.end_frame()
             
-            pygame.display.flip()
+            if not self.audio.started:
+                # First frame is on screen, now load the sounds
+                STARTUP.mark('first_frame')
+                self.audio.start()
         
+        self.audio.close()
+        if self.recorder:
+            self.recorder.save()
         pygame.quit()
  
 if __name__ == "__main__":
+    # 音效由 frontend.synth 在内存中合成，带 --export-wav 时导出 WAV 文件
+    if '--export-wav' in sys.argv:
+        print("音效文件已生成：" + ", ".join(export_wav('.')))
     game = Tetris()
     game.run()
  
\ No newline at end of file
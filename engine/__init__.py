@@ -0,0 +1 @@
+"""俄罗斯方块的纯逻辑部分，不依赖 pygame"""
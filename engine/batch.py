@@ -0,0 +1,197 @@
+"""NumPy 批量环境：N 局游戏放在一个连续数组里同步推进
+
+每局棋盘是 ROWS 个 uint16 行掩码（第 x 列对应第 x 位），底部额外垫了
+FLOOR_ROWS 个满行作为地板，这样落点检测不需要越界判断。一次 step
+调用对整批棋盘完成碰撞、落下、固定、消行和计分，结束的对局自动重开。
+
+动作是 (旋转次数, 目标列)：方块在出生行旋转并平移到目标列后直接落下，
+目标位置在出生行就有重叠视为顶出，对局结束。规则与 tetris.py 相同。
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from engine.bot import DEFAULT_WEIGHTS, FEATURES
+from engine.pieces import PIECES
+from engine.rules import COLUMNS, ROWS, SCORES
+
+FULL_ROW = (1 << COLUMNS) - 1
+FLOOR_ROWS = 4   # 方块最高 4 行
+
+
+def piece_arrays(pieces=PIECES):
+    """把旋转表转换成数组：masks[kind, rotation, row] 和 widths[kind, rotation]"""
+    masks = np.zeros((len(pieces), 4, 4), np.uint16)
+    widths = np.zeros((len(pieces), 4), np.int64)
+    for kind, rotations in enumerate(pieces):
+        for rotation, data in enumerate(rotations):
+            masks[kind, rotation, :data.height] = data.masks
+            widths[kind, rotation] = data.width
+    return masks, widths
+
+
+# BITS[mask] 是掩码按列展开的 0/1 向量，POPCOUNT[mask] 是置位个数
+BITS = ((np.arange(1 << COLUMNS)[:, None] >> np.arange(COLUMNS)) & 1).astype(np.uint8)
+POPCOUNT = BITS.sum(1, dtype=np.int64)
+
+
+def batch_features(rows, lines):
+    """对 (m, ROWS) 行掩码批量计算 (总高度, 空洞, 凹凸度, 消行数, 井深)，返回 (m, 5)"""
+    # covered 的第 y 行标记第 y 行及以上出现过方块的列
+    covered = np.bitwise_or.accumulate(rows, axis=1)
+    holes = POPCOUNT[covered & ~rows].sum(1)
+    heights = BITS[covered].sum(1, dtype=np.uint8).astype(np.int64)         # (m, COLUMNS)
+    bumpiness = np.abs(np.diff(heights, axis=1)).sum(1)
+    walls = np.full((len(rows), 1), ROWS)
+    padded = np.concatenate([walls, heights, walls], axis=1)
+    depth = np.minimum(padded[:, :-2], padded[:, 2:]) - heights
+    wells = np.clip(depth, 0, None).sum(1)
+    return np.stack([heights.sum(1), holes, bumpiness, lines, wells], axis=1)
+
+
+def compact_rows(rows):
+    """消除 (m, ROWS) 行掩码中的满行，返回 (新的行掩码, 每个棋盘消除的行数)"""
+    full = rows == FULL_ROW
+    cleared = full.sum(1)
+    changed = np.flatnonzero(cleared)
+    if len(changed):
+        rows = rows.copy()
+        # 稳定排序把满行挪到顶部，再清零，其余行保持原有顺序
+        order = np.argsort(~full[changed], axis=1, kind='stable')
+        compacted = np.take_along_axis(rows[changed], order, axis=1)
+        compacted[np.arange(rows.shape[1]) < cleared[changed, None]] = 0
+        rows[changed] = compacted
+    return rows, cleared
+
+
+class BatchEnv:
+    """同步推进 n 局游戏"""
+
+    def __init__(self, n, seed=None, pieces=PIECES, scores=SCORES):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.piece_masks, self.piece_widths = piece_arrays(pieces)
+        self.kinds = len(pieces)
+        self.score_table = np.asarray(scores, np.int64)
+        self.spawn_x = COLUMNS // 2 - self.piece_widths[:, 0] // 2
+
+        self.boards = np.zeros((n, ROWS + FLOOR_ROWS), np.uint16)
+        self.current = np.zeros(n, np.int64)
+        self.next = np.zeros(n, np.int64)
+        self.score = np.zeros(n, np.int64)
+        self.lines = np.zeros(n, np.int64)
+        self.pieces_placed = np.zeros(n, np.int64)
+        self.final_score = np.zeros(n, np.int64)
+        self.games_finished = 0
+
+        self._index = np.arange(n)
+        self._window = np.arange(4)
+        self._columns = np.arange(COLUMNS)
+        self.reset()
+
+    @property
+    def rows(self):
+        """(n, ROWS) 行掩码视图"""
+        return self.boards[:, :ROWS]
+
+    def cells(self):
+        """(n, ROWS, COLUMNS) 的 0/1 棋盘"""
+        return ((self.rows[:, :, None] >> self._columns) & 1).astype(np.uint8)
+
+    def reset(self, which=None):
+        """重开指定的对局，which 为 None 时全部重开"""
+        if which is None:
+            which = self._index
+        count = len(which)
+        self.boards[which, :ROWS] = 0
+        self.boards[which, ROWS:] = FULL_ROW
+        self.current[which] = self.rng.integers(0, self.kinds, count)
+        self.next[which] = self.rng.integers(0, self.kinds, count)
+        self.score[which] = 0
+        self.lines[which] = 0
+        self.pieces_placed[which] = 0
+
+    def legal_moves(self):
+        """(n, 4, COLUMNS) 布尔数组，标记每局当前方块可用的 (旋转, 列)"""
+        masks = self.piece_masks[self.current]                       # (n, 4, 4)
+        shifted = masks[:, :, None, :].astype(np.int64) << self._columns[:, None]
+        top = self.boards[:, None, None, :4]
+        free = ~((shifted & top) != 0).any(-1)                       # (n, 4, COLUMNS)
+        fits = self._columns + self.piece_widths[self.current][:, :, None] <= COLUMNS
+        return free & fits
+
+    def step(self, rotations, columns):
+        """每局放置一个方块，返回 (本步得分, 是否结束, 本步消除行数)
+
+        越界的列会被夹到合法范围内。结束的对局在返回前已经自动重开，
+        它们的最终得分可以在调用前从 score 中读取，或者使用 final_score。
+        """
+        index = self._index
+        kinds = self.current
+        rotations = np.asarray(rotations, np.int64) % 4
+        columns = np.clip(columns, 0, COLUMNS - self.piece_widths[kinds, rotations])
+        shifted = (self.piece_masks[kinds, rotations].astype(np.int64) << columns[:, None]).astype(np.uint16)
+
+        # hits[i, y]：方块放在第 y 行时是否重叠，地板保证每局都会命中
+        windows = sliding_window_view(self.boards, 4, axis=1)
+        hits = ((windows & shifted[:, None, :]) != 0).any(-1)
+        blocked = hits[:, 0]
+        land = np.argmax(hits[:, 1:], axis=1)
+
+        placed = ~blocked
+        rows = land[:, None] + self._window
+        self.boards[index[:, None], rows] |= np.where(placed[:, None], shifted, 0).astype(np.uint16)
+
+        self.boards[:, :ROWS], cleared = compact_rows(self.rows)
+
+        rewards = self.score_table[cleared]
+        self.score += rewards
+        self.lines += cleared
+        self.pieces_placed += placed
+
+        self.current = self.next
+        self.next = self.rng.integers(0, self.kinds, self.n)
+        spawn = self.piece_masks[self.current, 0].astype(np.int64) << self.spawn_x[self.current][:, None]
+        topped_out = ((spawn & self.boards[:, :4]) != 0).any(-1)
+
+        dones = blocked | topped_out
+        self.final_score = np.where(dones, self.score, 0)
+        finished = np.flatnonzero(dones)
+        if len(finished):
+            self.games_finished += len(finished)
+            self.reset(finished)
+        return rewards, dones, cleared
+
+    def best_moves(self, weights=None):
+        """一次性为整批棋盘枚举全部 4 x COLUMNS 个落点并用启发式打分
+
+        返回每局得分最高的 (旋转, 列)，可以直接传给 step。
+        """
+        weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        vector = np.array([weights[name] for name in FEATURES])
+        n = self.n
+        masks = self.piece_masks[self.current].astype(np.int64)               # (n, 4, 4)
+        shifted = (masks[:, :, None, :] << self._columns[:, None]).astype(np.uint16)
+        legal = self._columns + self.piece_widths[self.current][:, :, None] <= COLUMNS
+
+        windows = sliding_window_view(self.boards, 4, axis=1)[:, None, None]  # (n, 1, 1, ROWS + 1, 4)
+        pieces = shifted[:, :, :, None, :]
+        hits = ((windows[..., 0] & pieces[..., 0]) | (windows[..., 1] & pieces[..., 1])
+                | (windows[..., 2] & pieces[..., 2]) | (windows[..., 3] & pieces[..., 3])) != 0
+        legal &= ~hits[..., 0]
+        land = np.argmax(hits[..., 1:], axis=-1)                              # (n, 4, COLUMNS)
+
+        candidates = np.repeat(self.boards[:, None, None, :ROWS], 4, 1).repeat(COLUMNS, 2)
+        rows = land[..., None] + self._window
+        valid_rows = rows < ROWS
+        rows = np.minimum(rows, ROWS - 1)
+        stamp = np.where(valid_rows, shifted & FULL_ROW, 0).astype(np.uint16)
+        i, r, c = np.indices((n, 4, COLUMNS))
+        for k in range(4):
+            candidates[i, r, c, rows[..., k]] |= stamp[..., k]
+
+        flat, cleared = compact_rows(candidates.reshape(-1, ROWS))
+        scores = (batch_features(flat, cleared) @ vector).reshape(n, 4 * COLUMNS)
+        scores[~legal.reshape(n, -1)] = -np.inf
+        best = scores.argmax(1)
+        return best // COLUMNS, best % COLUMNS
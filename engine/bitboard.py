@@ -0,0 +1,168 @@
+"""位棋盘：每一行用一个整数位掩码表示，第 x 列对应第 x 位
+
+碰撞、固定和满行检测都只需要对方块的每一行做几次移位和按位与。
+颜色平面只用于绘制，和位掩码同步维护，搜索用的副本可以不带颜色平面。Zobrist 哈希在固定和消行时增量更新。
+消行只检查刚固定的方块占据的几行（满行就是掩码等于 full），行在原地下移。
+每列最高格子所在的行（天际线）也随固定和消行更新，影子和硬降的落点
+直接由方块底部轮廓和天际线算出，不用逐行下移检测。
+"""
+
+from engine.zobrist import row_keys
+
+
+def shape_masks(shape):
+    """把形状矩阵转换成逐行位掩码"""
+    return tuple(sum(1 << x for x, cell in enumerate(row) if cell) for row in shape)
+
+
+class Board:
+    """位掩码棋盘，兼容 grid[y][x] 形式的读取"""
+
+    __slots__ = ('columns', 'rows', 'full', 'masks', 'cells', 'keys', 'hash', 'tops')
+
+    def __init__(self, columns=10, rows=20):
+        self.columns = columns
+        self.rows = rows
+        self.full = (1 << columns) - 1
+        self.masks = [0] * rows
+        # 颜色平面：None 表示空格
+        self.cells = [[None] * columns for _ in range(rows)]
+        self.keys = row_keys(columns, rows)
+        self.hash = 0
+        # 每列最高格子所在的行号，空列为 rows
+        self.tops = [rows] * columns
+
+    def __getitem__(self, y):
+        return self.cells[y]
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __len__(self):
+        return self.rows
+
+    def collides(self, masks, width, x, y):
+        """形状左上角放在 (x, y) 时是否越界或与已有方块重叠"""
+        if x < 0 or y < 0 or x + width > self.columns or y + len(masks) > self.rows:
+            return True
+        board = self.masks
+        for mask in masks:
+            if board[y] & (mask << x):
+                return True
+            y += 1
+        return False
+
+    def drop_y(self, data, x, y):
+        """旋转数据为 data 的方块从 (x, y) 直接落下后的 y
+
+        方块每列最低的格子都在该列天际线之上时，落点只由底部轮廓和天际线决定；
+        方块被移到悬空部分下面时才退回逐行下移。
+        """
+        landing = self.landing_y(data, x)
+        if landing >= y:
+            return landing
+        while not self.collides(data.masks, data.width, x, y + 1):
+            y += 1
+        return y
+
+    def landing_y(self, data, x):
+        """方块在第 x 列从顶上直接落下时的 y，由底部轮廓和天际线算出，为负表示放不下"""
+        tops = self.tops
+        return min(tops[x + col] - bottom for col, bottom in enumerate(data.bottom)) - 1
+
+    def lock(self, masks, x, y, color):
+        """把形状写入棋盘"""
+        board = self.masks
+        tops = self.tops
+        cells = self.cells
+        for row_y, mask in enumerate(masks, y):
+            old = board[row_y]
+            bits = mask << x
+            new = board[row_y] = old | bits
+            keys = self.keys[row_y]
+            self.hash ^= keys[old] ^ keys[new]
+            row = cells[row_y] if cells is not None else None
+            # 只遍历方块占据的位
+            while bits:
+                low = bits & -bits
+                col = low.bit_length() - 1
+                if row is not None:
+                    row[col] = color
+                if row_y < tops[col]:
+                    tops[col] = row_y
+                bits ^= low
+
+    def clear_full_rows(self, start=0, stop=None):
+        """消除第 start 到 stop - 1 行中的满行，返回消除的行数
+
+        固定方块后只需要检查方块占据的几行。行在原列表里就地下移，
+        被消除的行清空后换到顶部重复使用，不新建列表。
+        """
+        full = self.full
+        masks = self.masks
+        if stop is None:
+            stop = self.rows
+        lowest = -1
+        for y in range(start, stop):
+            if masks[y] == full:
+                lowest = y
+        if lowest < 0:
+            return 0
+        # 最高的格子以上全是空行，最低的满行以下没有移动，只重算两者之间的行
+        top = min(self.tops)
+        keys = self.keys
+        for y in range(top, lowest + 1):
+            self.hash ^= keys[y][masks[y]]
+        cells = self.cells
+        write = lowest
+        for y in range(lowest, top - 1, -1):
+            if masks[y] != full:
+                masks[write] = masks[y]
+                if cells is not None:
+                    cells[write], cells[y] = cells[y], cells[write]
+                write -= 1
+        # 交换之后 top..write 正好是被消除的行
+        blank = (None,) * self.columns
+        for y in range(top, write + 1):
+            masks[y] = 0
+            if cells is not None:
+                cells[y][:] = blank
+        for y in range(top, lowest + 1):
+            self.hash ^= keys[y][masks[y]]
+        cleared = write - top + 1
+        # 消行只会让天际线下移，从新的最高处往下重新扫描
+        self.update_tops(top + cleared)
+        return cleared
+
+    def update_tops(self, start=0):
+        """从第 start 行往下扫描，重新求每列最高格子所在的行"""
+        tops = [self.rows] * self.columns
+        seen = 0
+        for y in range(start, self.rows):
+            new = self.masks[y] & ~seen
+            if new:
+                seen |= new
+                while new:
+                    low = new & -new
+                    tops[low.bit_length() - 1] = y
+                    new ^= low
+                if seen == self.full:
+                    break
+        self.tops = tops
+
+    def copy(self, cells=True):
+        """独立的副本，行掩码、颜色平面和天际线都复制，Zobrist 键表共用
+
+        cells=False 时副本没有颜色平面（cells 为 None），供只看行掩码的搜索使用，
+        固定和消行照常更新掩码、哈希和天际线。
+        """
+        board = Board.__new__(Board)
+        board.columns = self.columns
+        board.rows = self.rows
+        board.full = self.full
+        board.masks = self.masks[:]
+        board.cells = [row[:] for row in self.cells] if cells and self.cells is not None else None
+        board.keys = self.keys
+        board.hash = self.hash
+        board.tops = self.tops[:]
+        return board
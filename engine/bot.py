@@ -0,0 +1,187 @@
+"""自动玩家：枚举当前方块的所有落点，用加权启发式给落下后的棋盘打分
+
+搜索在不带颜色平面的 Board 副本上进行，落点、固定和消行都用 Board 自己的方法：
+落点由天际线和方块底部轮廓直接算出（Board.landing_y），固定和局部消行时
+天际线和 Zobrist 哈希增量更新，打分直接读天际线，子棋盘的哈希也不用重算。
+"""
+
+from functools import lru_cache
+
+from engine.game_state import GameState, LEFT, RIGHT, ROTATE, HARD_DROP
+from engine.pieces import PIECES
+
+# 启发式权重：总高度、空洞、凹凸度、消行数、井深
+DEFAULT_WEIGHTS = {
+    'height': -0.51,
+    'holes': -0.36,
+    'bumpiness': -0.18,
+    'lines': 0.76,
+    'wells': -0.10,
+}
+FEATURES = tuple(DEFAULT_WEIGHTS)
+
+MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def distinct_rotations(pieces=PIECES):
+    """每种方块形状互不相同的旋转状态，O 只有 1 个，I/S/Z 有 2 个"""
+    result = []
+    for rotations in pieces:
+        seen = set()
+        kinds = []
+        for rotation, data in enumerate(rotations):
+            if data.masks not in seen:
+                seen.add(data.masks)
+                kinds.append(rotation)
+        result.append(tuple(kinds))
+    return tuple(result)
+
+
+def features(board, lines=0):
+    """计算 (总高度, 空洞, 凹凸度, 消行数, 井深)
+
+    每个已占格子都在本列天际线以下，所以空洞数 = 总高度 - 已占格子数。
+    """
+    rows = board.rows
+    heights = [rows - top for top in board.tops]
+    height = sum(heights)
+    holes = height - sum(mask.bit_count() for mask in board.masks[rows - max(heights):])
+    bumpiness = sum(abs(left - right) for left, right in zip(heights, heights[1:]))
+    # 两侧的墙按满高计算
+    walls = [rows, *heights, rows]
+    wells = 0
+    for left, middle, right in zip(walls, heights, walls[2:]):
+        depth = (left if left < right else right) - middle
+        if depth > 0:
+            wells += depth
+    return height, holes, bumpiness, lines, wells
+
+
+def placements(board, kind, pieces=PIECES, rotations=None):
+    """枚举所有落点，产生 (旋转, 列, 落点行, 新棋盘, 消除行数)，新棋盘不带颜色平面"""
+    for rotation in rotations or distinct_rotations(pieces)[kind]:
+        data = pieces[kind][rotation]
+        for x in range(board.columns - data.width + 1):
+            y = board.landing_y(data, x)
+            if y < 0:
+                continue
+            child = board.copy(cells=False)
+            child.lock(data.masks, x, y, None)
+            yield rotation, x, y, child, child.clear_full_rows(y, y + data.height)
+
+
+class Bot:
+    """一层搜索的自动玩家
+
+    cache 是可选的 LRUCache，以 (棋盘哈希, 方块表, 方块, 预览方块) 为键保存搜索结果，
+    不同走法到达同一棋盘时直接复用。两套规则的方块编号含义不同，方块表按对象身份区分。
+    """
+
+    def __init__(self, weights=None, cache=None):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self._vector = tuple(self.weights[name] for name in FEATURES)
+        self.cache = cache
+
+    def evaluate(self, board, lines=0):
+        """给棋盘打分，分数越高越好"""
+        return sum(w * f for w, f in zip(self._vector, features(board, lines)))
+
+    def best_placement(self, board, kind, pieces=PIECES, preview=None):
+        """返回得分最高的 (旋转, 列, 落点行)，无处可放时返回 None"""
+        if self.cache is not None:
+            key = (board.hash, id(pieces), kind, preview)
+            best = self.cache.get(key, MISSING)
+            if best is not MISSING:
+                return best
+        best = None
+        best_score = float('-inf')
+        for rotation, x, y, child, lines in placements(board, kind, pieces):
+            score = self.evaluate(child, lines)
+            if score > best_score:
+                best_score = score
+                best = rotation, x, y
+        if self.cache is not None:
+            self.cache.put(key, best)
+        return best
+
+    def choose(self, state):
+        """为 GameState 的当前方块选择 (旋转, 列)"""
+        best = self.best_placement(state.board, state.current.kind, state.pieces)
+        if best is None:
+            # 无处可放，原地落下
+            return state.current.rotation, state.current.x
+        return best[0], best[1]
+
+    def next_action(self, state, target):
+        """朝目标 (旋转, 列) 前进的下一个按键动作"""
+        piece = state.current
+        rotation, x = target
+        if piece.rotation != rotation:
+            return ROTATE
+        if piece.x < x:
+            return RIGHT
+        if piece.x > x:
+            return LEFT
+        return HARD_DROP
+
+    def play(self, state):
+        """直接放下当前方块，用于无界面模拟"""
+        rotation, x = self.choose(state)
+        return state.place(rotation, x)
+
+
+class BotDriver:
+    """让前端按固定节奏逐个播放自动玩家的按键动作
+
+    每次都根据方块的当前位置决定下一步，墙踢或重力改变位置后也能走到目标。
+    """
+
+    def __init__(self, bot=None, action_frames=4):
+        self.bot = bot or Bot()
+        self.action_frames = action_frames
+        self.enabled = False
+        self.target = None
+        self.timer = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.target = None
+        self.timer = 0
+
+    def update(self, state):
+        """每帧调用一次，到时间就执行下一个动作并返回结果"""
+        if not self.enabled or state.paused or state.game_over:
+            return None
+        self.timer += 1
+        if self.timer < self.action_frames:
+            return None
+        self.timer = 0
+        if self.target is None:
+            self.target = self.bot.choose(state)
+        action = self.bot.next_action(state, self.target)
+        result = state.step(action)
+        if action != HARD_DROP and not (result.moved or result.rotated):
+            # 被挡住了，就地落下
+            self.target = state.current.rotation, state.current.x
+        self.notify(result)
+        return result
+
+    def notify(self, result):
+        """方块固定后重新选择目标，前端对重力的结果也要调用"""
+        if result.locked:
+            self.target = None
+
+
+def play_game(seed=None, weights=None, max_pieces=None, bot=None):
+    """用自动玩家从头玩一局，返回结束时的 GameState
+
+    bot 是可以跨局复用的 Bot，给出时忽略 weights。
+    """
+    state = GameState(seed)
+    bot = bot or Bot(weights)
+    while not state.game_over:
+        if max_pieces is not None and state.pieces_placed >= max_pieces:
+            break
+        bot.play(state)
+    return state
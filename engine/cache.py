@@ -0,0 +1,50 @@
+"""带命中统计的 LRU 缓存"""
+
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class LRUCache:
+    """容量有限的缓存，满了以后淘汰最久没有用到的条目"""
+
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def get(self, key, default=None):
+        value = self.data.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def clear(self):
+        self.data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {'size': len(self.data), 'maxsize': self.maxsize,
+                'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate}
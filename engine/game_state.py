@@ -0,0 +1,241 @@
+"""无界面的游戏核心
+
+GameState 不依赖 pygame，前端只负责把按键翻译成动作、每帧调用 tick，
+再根据返回的事件播放音效和绘制画面。没有窗口也能以任意速度模拟整局游戏。
+"""
+
+import random
+import struct
+import zlib
+
+from engine.bitboard import Board
+from engine.pieces import CSDN_PIECES, PIECES, Piece
+from engine.rules import COLUMNS, ROWS, SCORES, CSDN_KICKS, CSDN_SCORES, csdn_gravity_frames
+
+# 动作
+LEFT = 'left'
+RIGHT = 'right'
+ROTATE = 'rotate'
+SOFT_DROP = 'soft_drop'
+HARD_DROP = 'hard_drop'
+PAUSE = 'pause'
+ACTIONS = (LEFT, RIGHT, ROTATE, SOFT_DROP, HARD_DROP, PAUSE)
+
+FPS = 60                # 逻辑帧率
+GRAVITY_FRAMES = 30     # 每 30 帧（0.5 秒）自动下落一格
+NO_KICKS = ((0, 0),)    # 只在原地旋转
+
+
+class StepResult:
+    """一次 step 或 tick 产生的事件"""
+
+    __slots__ = ('moved', 'rotated', 'locked', 'lines_cleared', 'score_delta', 'game_over')
+
+    def __init__(self):
+        self.moved = False
+        self.rotated = False
+        self.locked = False
+        self.lines_cleared = 0
+        self.score_delta = 0
+        self.game_over = False
+
+    def merge(self, other):
+        """把另一次结果累加进来"""
+        self.moved = self.moved or other.moved
+        self.rotated = self.rotated or other.rotated
+        self.locked = self.locked or other.locked
+        self.lines_cleared += other.lines_cleared
+        self.score_delta += other.score_delta
+        self.game_over = self.game_over or other.game_over
+        return self
+
+
+class GameState:
+    """一局游戏的全部状态"""
+
+    def __init__(self, seed=None, pieces=PIECES, scores=SCORES, kicks=NO_KICKS,
+                 gravity_frames=GRAVITY_FRAMES, gravity_curve=None, above_top=False, hard_drop_scores=True):
+        self.pieces = pieces
+        self.scores = scores
+        self.kicks = kicks
+        # above_top：方块可以伸出棋盘顶部，顶上的格子不算碰撞，固定时丢掉
+        self.above_top = above_top
+        # hard_drop_scores：硬降消行是否计分
+        self.hard_drop_scores = hard_drop_scores
+        self.gravity_frames = gravity_frames
+        # gravity_curve(score) 返回随分数变化的下落间隔帧数
+        self.gravity_curve = gravity_curve
+        # 录像器，见 engine.replay
+        self.recorder = None
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """开始新的一局，seed 相同则方块序列相同，不传时随机选一个"""
+        if seed is None:
+            seed = random.getrandbits(63)
+        if self.recorder:
+            self.recorder.reset(seed)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.board = Board(COLUMNS, ROWS)
+        self.score = 0
+        self.lines = 0
+        self.pieces_placed = 0
+        self.frame = 0
+        self.fall_frames = 0
+        self.paused = False
+        self.game_over = False
+        self.current = self.spawn()
+        self.next = self.spawn()
+
+    def spawn(self):
+        """随机生成一个方块"""
+        return Piece(self.rng.randrange(len(self.pieces)), table=self.pieces)
+
+    def collides(self, piece, dx=0, dy=0):
+        data = piece.data
+        y = piece.y + dy
+        if y < 0 and self.above_top:
+            # 只检查落在棋盘里的行，左右仍然不能出界
+            return self.board.collides(data.masks[-y:], data.width, piece.x + dx, 0)
+        return self.board.collides(data.masks, data.width, piece.x + dx, y)
+
+    def drop_y(self, piece=None):
+        """方块直接落下后的 y 坐标"""
+        piece = piece or self.current
+        if piece.y < 0:
+            # 伸出顶部时天际线算不出落点，逐行下移
+            dy = 0
+            while not self.collides(piece, 0, dy + 1):
+                dy += 1
+            return piece.y + dy
+        return self.board.drop_y(piece.data, piece.x, piece.y)
+
+    def step(self, action):
+        """执行一个玩家动作"""
+        if self.recorder:
+            self.recorder.action(action)
+        result = StepResult()
+        if action == PAUSE:
+            if not self.game_over:
+                self.paused = not self.paused
+            return result
+        if self.paused or self.game_over:
+            return result
+
+        piece = self.current
+        if action == LEFT or action == RIGHT:
+            dx = -1 if action == LEFT else 1
+            if not self.collides(piece, dx, 0):
+                piece.x += dx
+                result.moved = True
+        elif action == ROTATE:
+            piece.rotate()
+            for dx, dy in self.kicks:
+                if not self.collides(piece, dx, dy):
+                    piece.x += dx
+                    piece.y += dy
+                    result.rotated = True
+                    break
+            else:
+                piece.rotate(-1)
+        elif action == SOFT_DROP:
+            if not self.collides(piece, 0, 1):
+                piece.y += 1
+            else:
+                self._lock(result)
+        elif action == HARD_DROP:
+            piece.y = self.drop_y(piece)
+            self._lock(result, self.hard_drop_scores)
+        else:
+            raise ValueError(f'未知动作: {action!r}')
+        return result
+
+    def place(self, rotation, x):
+        """把当前方块转到指定旋转状态、移到 x 列后直接落下
+
+        目标位置放不下时保持原来的旋转和位置落下。供自动玩家和批量模拟使用。
+        """
+        if self.recorder:
+            self.recorder.place(rotation, x)
+        result = StepResult()
+        if self.paused or self.game_over:
+            return result
+        piece = self.current
+        rotation, piece.rotation = piece.rotation, rotation
+        x, piece.x = piece.x, x
+        if self.collides(piece):
+            piece.rotation = rotation
+            piece.x = x
+        piece.y = self.drop_y(piece)
+        self._lock(result, self.hard_drop_scores)
+        return result
+
+    def tick(self, frames=1):
+        """推进若干逻辑帧，处理自动下落"""
+        result = StepResult()
+        for _ in range(frames):
+            if self.paused or self.game_over:
+                break
+            self.frame += 1
+            self.fall_frames += 1
+            if self.gravity_curve:
+                self.gravity_frames = self.gravity_curve(self.score)
+            if self.fall_frames >= self.gravity_frames:
+                self.fall_frames = 0
+                if not self.collides(self.current, 0, 1):
+                    self.current.y += 1
+                else:
+                    self._lock(result)
+        if self.recorder:
+            self.recorder.ticked(frames)
+        return result
+
+    def checksum(self):
+        """棋盘、方块和分数的 CRC32，用于检查录像回放是否一致"""
+        piece = self.current
+        data = struct.pack(f'<{len(self.board.masks)}I', *self.board.masks)
+        data += struct.pack('<5iq', piece.kind, piece.rotation, piece.x, piece.y, self.next.kind, self.score)
+        return zlib.crc32(data)
+
+    def _lock(self, result, scored=True):
+        """固定当前方块、消行计分并生成下一块"""
+        piece = self.current
+        data = piece.data
+        masks = data.masks
+        y = piece.y
+        if y < 0:
+            # 伸出棋盘顶部的格子丢掉
+            masks = masks[-y:]
+            y = 0
+        # 颜色平面里记录方块种类 + 1，0/None 表示空格
+        self.board.lock(masks, piece.x, y, piece.kind + 1)
+        # 只有方块占据的几行可能被填满
+        cleared = self.board.clear_full_rows(y, piece.y + data.height)
+        delta = self.scores[cleared] if scored else 0
+        self.score += delta
+        self.lines += cleared
+        self.pieces_placed += 1
+        result.locked = True
+        result.lines_cleared += cleared
+        result.score_delta += delta
+
+        self.current = self.next
+        self.next = self.spawn()
+        self.fall_frames = 0
+        if self.collides(self.current):
+            self.game_over = True
+            result.game_over = True
+
+
+# 两个前端使用的规则；csdn 原版的碰撞检测不管棋盘顶部，硬降消行不计分
+RULESETS = {
+    'tetris': {},
+    'csdn': {'pieces': CSDN_PIECES, 'scores': CSDN_SCORES, 'kicks': CSDN_KICKS,
+             'gravity_curve': csdn_gravity_frames, 'above_top': True, 'hard_drop_scores': False},
+}
+
+
+def new_game(ruleset='tetris', seed=None):
+    """按规则名创建一局游戏"""
+    return GameState(seed, **RULESETS[ruleset])
@@ -0,0 +1,189 @@
+"""可达落点生成：从方块当前位置出发，按游戏的真实操作在 (x, y, 旋转) 上做广度优先搜索
+
+“转好再从顶上直接落下”会漏掉滑入悬空部分下方的落点（tuck/slide），
+堆得很高时又会给出实际走不到的落点。这里按 GameState.step 的规则搜索：
+左移、右移、软降各走一格，旋转按规则的踢墙偏移依次尝试，取第一个不碰撞的位置。
+从任一搜到的状态硬降就得到一个落点，同一落点只保留操作最少的路径。
+
+状态集合全部按旋转和行存成位掩码 [旋转][y]，第 x 位表示方块左上角在 x 列，和棋盘行掩码的布局相同：
+    fits      放得下的位置，每个 (旋转, 行) 由方块各格对棋盘行移位求或得到
+    visited   已经搜到的状态
+    layer     广度优先的一层，同一行的所有状态用几次移位和按位与一起扩展
+只保存每一层的位掩码，落点的操作路径从所在的层往回推出。
+形状相同的旋转状态（O 的 4 个、I/S/Z 的 2 个）落在同一位置时算同一个落点。
+规则允许方块伸出棋盘顶部时（GameState.above_top），搜索的行从 -above 开始，数组下标统一加 above。
+不考虑重力：操作足够快时重力不会把方块带离搜索到的路径。
+"""
+
+from engine.game_state import HARD_DROP, LEFT, NO_KICKS, RIGHT, ROTATE, SOFT_DROP
+from engine.pieces import PIECES
+
+
+def canonical_rotations(rotations):
+    """每个旋转状态对应的、形状相同的最小旋转下标"""
+    first = {}
+    return tuple(first.setdefault(data.masks, rotation) for rotation, data in enumerate(rotations))
+
+
+def _shift(mask, dx):
+    """整行位置右移 dx 列（dx 为负时左移）"""
+    return mask << dx if dx >= 0 else mask >> -dx
+
+
+def fit_masks(board, rotations, above=0):
+    """fits[r][y + above]：旋转状态 r 在第 y 行放得下的 x 位置掩码，above 是允许伸出顶部的行数"""
+    rows = board.masks
+    top = min(board.tops)
+    fits = []
+    for data in rotations:
+        valid = (1 << (board.columns - data.width + 1)) - 1
+        cells = [(i, col) for i, mask in enumerate(data.masks) for col in range(data.width) if mask >> col & 1]
+        by_row = [0] * (board.rows + above)
+        for y in range(-above, board.rows - data.height + 1):
+            if y + data.height <= top:
+                # 整个方块都在最高的格子之上
+                by_row[y + above] = valid
+                continue
+            blocked = 0
+            for i, col in cells:
+                if y + i >= 0:
+                    blocked |= rows[y + i] >> col
+            by_row[y + above] = valid & ~blocked
+        fits.append(by_row)
+    return fits
+
+
+class Reachability:
+    """一次搜索的结果：placements 是所有不同落点 [(旋转, 列, 落点行)]，path() 给出到达某个落点的操作
+
+    批量模拟时通常只需要落点，路径只对最后选中的那个求。
+    """
+
+    def __init__(self, board, kind, rotation=0, x=None, y=0, pieces=PIECES, kicks=NO_KICKS, above_top=False):
+        rotations = pieces[kind]
+        if x is None:
+            x = board.columns // 2 - rotations[rotation].width // 2
+        # 只有踢墙的 (0, -1) 能往上走，而且要原地旋转被棋盘里的格子挡住，
+        # 所以方块最多整个伸出顶部一个方块高
+        self.above = above = max(data.height for data in rotations) if above_top else 0
+        self.rows = rows = board.rows + above
+        self.kicks = kicks
+        self.fits = fits = fit_masks(board, rotations, above)
+        y += above
+        self.layers = []
+        self.sources = {}   # 落点 -> (层数, 硬降前所在的行)
+        if not (0 <= y < rows and fits[rotation][y] >> x & 1):
+            self.placements = []
+            return
+        canonical = canonical_rotations(rotations)
+        visited = [[0] * rows for _ in rotations]
+        # dropped[r][y]：硬降落点已经记录过的状态，同一列再往下的状态不用再落一遍
+        dropped = [[0] * rows for _ in rotations]
+        visited[rotation][y] = 1 << x
+        layer = {(rotation, y): 1 << x}
+        found = {}
+        depth = 0
+        while layer:
+            self.layers.append(layer)
+            following = {}
+
+            def add(r, y, moved):
+                moved &= ~visited[r][y]
+                if moved:
+                    visited[r][y] |= moved
+                    following[r, y] = following.get((r, y), 0) | moved
+
+            for (r, row), states in layer.items():
+                by_row = fits[r]
+                # 这一层的状态硬降：逐行往下，放不下的就是落点
+                falling = states & ~dropped[r][row]
+                fall_y = row
+                while falling:
+                    dropped[r][fall_y] |= falling
+                    below = by_row[fall_y + 1] if fall_y + 1 < rows else 0
+                    landed = falling & ~below
+                    while landed:
+                        low = landed & -landed
+                        landed ^= low
+                        key = (canonical[r], low.bit_length() - 1, fall_y)
+                        if key not in found:
+                            placement = found[key] = (r, low.bit_length() - 1, fall_y - above)
+                            self.sources[placement] = (depth, row)
+                    fall_y += 1
+                    falling &= below & ~dropped[r][fall_y] if fall_y < rows else 0
+
+                # 左右移动
+                add(r, row, (states >> 1 | states << 1) & by_row[row])
+                # 旋转：每个位置取第一个放得下的踢墙偏移
+                turned = (r + 1) % 4
+                remaining = states
+                for dx, dy in kicks:
+                    ty = row + dy
+                    if not 0 <= ty < rows:
+                        continue
+                    ok = remaining & _shift(fits[turned][ty], -dx)
+                    if ok:
+                        add(turned, ty, _shift(ok, dx))
+                        remaining &= ~ok
+                        if not remaining:
+                            break
+                # 软降
+                if row + 1 < rows:
+                    add(r, row + 1, states & by_row[row + 1])
+            layer = following
+            depth += 1
+        self.placements = list(found.values())
+
+    def fit(self, r, y):
+        return self.fits[r][y] if 0 <= y < self.rows else 0
+
+    def _predecessor(self, depth, r, x, y):
+        """第 depth 层的状态在上一层的前驱和到达它所用的动作"""
+        layer = self.layers[depth - 1]
+        row = layer.get((r, y), 0)
+        if row >> (x + 1) & 1:
+            return (r, x + 1, y), LEFT
+        if x and row >> (x - 1) & 1:
+            return (r, x - 1, y), RIGHT
+        if layer.get((r, y - 1), 0) >> x & 1:
+            return (r, x, y - 1), SOFT_DROP
+        prev = (r - 1) % 4
+        for k, (dx, dy) in enumerate(self.kicks):
+            px, py = x - dx, y - dy
+            if px < 0 or not layer.get((prev, py), 0) >> px & 1:
+                continue
+            # 从前驱旋转时，排在前面的偏移都必须放不下
+            if not any(_shift(self.fit(r, py + ey), -ex) >> px & 1 for ex, ey in self.kicks[:k]):
+                return (prev, px, py), ROTATE
+        raise AssertionError(f'状态 {(r, x, y)} 在第 {depth - 1} 层没有前驱')
+
+    def path(self, placement):
+        """到达落点 (旋转, 列, 落点行) 并固定的操作列表，最后一个总是 HARD_DROP"""
+        depth, row = self.sources[placement]
+        r, x, _ = placement
+        # row 和各层的行号都是加了 above 的下标
+        state = (r, x, row)
+        actions = [HARD_DROP]
+        while depth:
+            state, action = self._predecessor(depth, *state)
+            actions.append(action)
+            depth -= 1
+        actions.reverse()
+        return actions
+
+
+def reachable(board, kind, rotation=0, x=None, y=0, pieces=PIECES, kicks=NO_KICKS, above_top=False):
+    """从 (x, y, rotation) 出发能固定下来的所有不同落点
+
+    返回 [(旋转, 列, 落点行, 操作列表)]，操作列表依次交给 GameState.step 即可到达并固定，
+    最后一个操作总是 HARD_DROP。起始位置本身就碰撞时返回空列表。
+    """
+    search = Reachability(board, kind, rotation, x, y, pieces, kicks, above_top)
+    return [placement + (search.path(placement),) for placement in search.placements]
+
+
+def reachable_placements(state):
+    """GameState 当前方块按该局规则（踢墙表、能否伸出顶部）的可达落点"""
+    piece = state.current
+    return reachable(state.board, piece.kind, piece.rotation, piece.x, piece.y, state.pieces, state.kicks,
+                     state.above_top)
@@ -0,0 +1,95 @@
+"""方块旋转表：导入时为每种方块的 4 个旋转状态预先算好所有数据
+
+旋转只是改变下标，碰撞、影子和绘制都直接读取表中的数据。
+"""
+
+from engine.bitboard import shape_masks
+from engine.rules import COLUMNS, CSDN_SHAPES, SHAPES
+
+
+def rotate_shape(shape):
+    """顺时针旋转形状矩阵"""
+    return [list(row) for row in zip(*shape[::-1])]
+
+
+class PieceRotation:
+    """某种方块某个旋转状态的预计算数据"""
+
+    __slots__ = ('shape', 'cells', 'masks', 'width', 'height', 'bottom')
+
+    def __init__(self, shape):
+        self.shape = tuple(tuple(row) for row in shape)
+        # 格子偏移 (x, y)，按行优先排列
+        self.cells = tuple((x, y) for y, row in enumerate(shape) for x, cell in enumerate(row) if cell)
+        self.masks = shape_masks(shape)
+        self.width = len(shape[0])
+        self.height = len(shape)
+        # 每一列最低格子的行偏移
+        self.bottom = tuple(max(y for x, y in self.cells if x == col) for col in range(self.width))
+
+
+def build_piece_table(shapes):
+    """为每种形状生成 4 个旋转状态，table[kind][rotation]"""
+    table = []
+    for shape in shapes:
+        rotations = []
+        for _ in range(4):
+            rotations.append(PieceRotation(shape))
+            shape = rotate_shape(shape)
+        table.append(tuple(rotations))
+    return tuple(table)
+
+
+PIECES = build_piece_table(SHAPES)
+CSDN_PIECES = build_piece_table(CSDN_SHAPES)
+
+
+class Piece:
+    """正在下落的方块，只记录种类、旋转状态和位置"""
+
+    __slots__ = ('kind', 'rotation', 'x', 'y', 'table')
+
+    def __init__(self, kind, rotation=0, table=PIECES):
+        self.kind = kind
+        self.rotation = rotation
+        self.table = table
+        self.x = COLUMNS // 2 - table[kind][rotation].width // 2
+        self.y = 0
+
+    @property
+    def data(self):
+        # 当前旋转状态的预计算数据
+        return self.table[self.kind][self.rotation]
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def cells(self):
+        return self.data.cells
+
+    @property
+    def masks(self):
+        return self.data.masks
+
+    @property
+    def width(self):
+        return self.data.width
+
+    @property
+    def height(self):
+        return self.data.height
+
+    def rotate(self, turns=1):
+        # 顺时针旋转，只改变旋转下标
+        self.rotation = (self.rotation + turns) % 4
+
+    def copy(self):
+        piece = Piece.__new__(type(self))
+        piece.kind = self.kind
+        piece.rotation = self.rotation
+        piece.table = self.table
+        piece.x = self.x
+        piece.y = self.y
+        return piece
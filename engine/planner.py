@@ -0,0 +1,133 @@
+"""向前看的自动玩家：当前方块 + 预览方块（+ 若干假设方块）的束搜索
+
+搜索按层加深：先只看当前方块，再加上预览方块，再往后每层加一个未知方块
+（对 7 种方块取平均，即期望最优）。每个节点只展开静态估值最好的 width 个落点。
+每加深一层都是一次完整的搜索，时间预算用完时丢弃正在进行的那一层，
+返回最深一次完整搜索的结果，所以第一层总会完成，最坏也和一层搜索的 Bot 一样好。
+按前两层的耗时之比估计下一层的耗时，估计在截止时间之前做不完的一层直接不做。
+
+时间预算按单调时钟计算，默认 8 毫秒，放在 60 帧的游戏循环里不会掉帧。
+限时的默认层数是 2（当前 + 预览）：第 3 层要对 7 种方块取平均，8 毫秒内做不完。
+budget=None 时不限时间，默认搜 DEEP_DEPTH 层，结果完全确定，适合无界面对局和比较。
+"""
+
+import time
+
+from engine.bot import MISSING, Bot, placements
+from engine.pieces import PIECES
+
+BEAM_WIDTH = 6      # 每个节点展开的落点数
+DEPTH = 2           # 限时搜索：当前 + 预览
+DEEP_DEPTH = 3      # 不限时间：再加 1 个未知方块
+BUDGET = 0.008      # 每次决策的时间预算（秒）
+DEAD = float('-inf')
+
+
+class _Timeout(Exception):
+    pass
+
+
+class BeamBot(Bot):
+    """cache 只保存搜满 depth 层的结果，键是 (棋盘哈希, 方块表, (当前方块, 预览方块))"""
+
+    def __init__(self, weights=None, cache=None, width=BEAM_WIDTH, depth=None, budget=BUDGET,
+                 clock=time.perf_counter):
+        super().__init__(weights, cache)
+        self.width = width
+        if depth is None:
+            depth = DEEP_DEPTH if budget is None else DEPTH
+        self.depth = depth
+        self.budget = budget
+        self.clock = clock
+        self.deadline = None
+        self.last_depth = 0     # 上一次决策完成的层数
+
+    def _children(self, board, lines, kind, pieces, limit):
+        """静态估值最好的 limit 个落点 [(估值, (旋转, 列, 落点行), 新棋盘, 累计消行)]"""
+        children = []
+        for rotation, x, y, child, cleared in placements(board, kind, pieces):
+            total = lines + cleared
+            children.append((self.evaluate(child, total), (rotation, x, y), child, total))
+        children.sort(key=lambda child: -child[0])
+        return children[:limit]
+
+    def _search(self, board, lines, kinds, hidden, pieces):
+        """从这个棋盘继续放 kinds 和 hidden 个未知方块后能达到的最好估值"""
+        if self.deadline is not None and self.clock() > self.deadline:
+            raise _Timeout
+        if kinds:
+            children = self._children(board, lines, kinds[0], pieces, self.width)
+            if not kinds[1:] and not hidden:
+                return children[0][0] if children else DEAD
+            return max((self._search(child, total, kinds[1:], hidden, pieces)
+                        for _, _, child, total in children), default=DEAD)
+        total = 0.0
+        for kind in range(len(pieces)):
+            total += self._search(board, lines, (kind,), hidden - 1, pieces)
+        return total / len(pieces)
+
+    def _root(self, board, kinds, hidden, pieces):
+        limit = None if len(kinds) == 1 and not hidden else self.width
+        children = self._children(board, 0, kinds[0], pieces, limit)
+        best = None
+        best_score = DEAD
+        for score, move, child, lines in children:
+            if len(kinds) > 1 or hidden:
+                score = self._search(child, lines, kinds[1:], hidden, pieces)
+            if best is None or score > best_score:
+                best_score = score
+                best = move
+        return best
+
+    def plan(self, board, kinds, pieces=PIECES, deadline=None):
+        """kinds 是已知的方块序列（当前, 预览），返回 (最好的 (旋转, 列, 落点行), 完成的层数)
+
+        第一层不受 deadline 限制，之后每层超时就返回上一层的结果。
+        """
+        best = None
+        done = 0
+        costs = []
+        for depth in range(1, self.depth + 1):
+            if deadline is not None and len(costs) >= 2:
+                # 下一层的耗时按最近两层的增长倍数估计
+                estimate = costs[-1] * costs[-1] / max(costs[-2], 1e-9)
+                if self.clock() + estimate > deadline:
+                    break
+            known = tuple(kinds[:depth])
+            self.deadline = deadline if depth > 1 else None
+            start = self.clock()
+            try:
+                move = self._root(board, known, depth - len(known), pieces)
+            except _Timeout:
+                break
+            finally:
+                self.deadline = None
+            costs.append(self.clock() - start)
+            best = move
+            done = depth
+            if move is None:
+                break
+        return best, done
+
+    def best_placement(self, board, kind, pieces=PIECES, preview=None):
+        """返回得分最高的 (旋转, 列, 落点行)，无处可放时返回 None"""
+        kinds = (kind,) if preview is None else (kind, preview)
+        if self.cache is not None:
+            key = (board.hash, id(pieces), kinds)
+            best = self.cache.get(key, MISSING)
+            if best is not MISSING:
+                self.last_depth = self.depth
+                return best
+        deadline = None if self.budget is None else self.clock() + self.budget
+        best, self.last_depth = self.plan(board, kinds, pieces, deadline)
+        if self.cache is not None and self.last_depth == self.depth:
+            self.cache.put(key, best)
+        return best
+
+    def choose(self, state):
+        """为 GameState 的当前方块选择 (旋转, 列)，同时考虑预览方块"""
+        best = self.best_placement(state.board, state.current.kind, state.pieces,
+                                   preview=state.next.kind)
+        if best is None:
+            return state.current.rotation, state.current.x
+        return best[0], best[1]
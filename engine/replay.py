@@ -0,0 +1,198 @@
+"""确定性录像：记录随机种子和按帧标记的输入，无界面全速回放
+
+录像文件格式（小端）：
+    文件头  b'TRPL' | 版本 u8 | 规则名长度 u8 | 规则名 | 种子 u64 | 校验间隔 u16
+    记录    帧差 varint | 类型 u8 | 附加数据
+        0-5  动作，下标对应 engine.game_state.ACTIONS
+        6    PLACE     旋转 u8 | 列 u8
+        7    RESET     新种子 u64
+        8    CHECKSUM  u32，GameState.checksum()
+        9    END       最终校验 u32 | 最终分数 u32
+
+帧号是已经推进的逻辑帧数：同一帧内先 tick 再执行该帧的动作。
+回放时每遇到一条校验记录就比较状态，发现不一致立即报告分歧的帧号。
+
+命令行：python -m engine.replay 录像文件 [--repeat N]
+"""
+
+import struct
+import sys
+import time
+
+from engine.game_state import ACTIONS, new_game
+
+MAGIC = b'TRPL'
+VERSION = 1
+CHECKSUM_INTERVAL = 60   # 每秒记录一次状态校验
+
+PLACE = 6
+RESET = 7
+CHECKSUM = 8
+END = 9
+
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+
+class ReplayDivergence(Exception):
+    """回放的状态和录制时不一致"""
+
+    def __init__(self, frame, expected, actual):
+        super().__init__(f'第 {frame} 帧状态不一致: 录制 {expected:#010x}, 回放 {actual:#010x}')
+        self.frame = frame
+        self.expected = expected
+        self.actual = actual
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+class Recorder:
+    """挂在 GameState.recorder 上，记录种子、动作和定期校验"""
+
+    def __init__(self, state, ruleset='tetris', path=None, checksum_interval=CHECKSUM_INTERVAL):
+        self.state = state
+        self.path = path
+        self.ruleset = ruleset
+        self.seed = state.seed
+        self.checksum_interval = checksum_interval
+        self.frame = 0
+        self.last_frame = 0
+        self.next_checksum = checksum_interval
+        self.data = bytearray()
+        state.recorder = self
+
+    def _record(self, code):
+        write_varint(self.data, self.frame - self.last_frame)
+        self.last_frame = self.frame
+        self.data.append(code)
+
+    def action(self, action):
+        self._record(ACTION_CODES[action])
+
+    def place(self, rotation, x):
+        self._record(PLACE)
+        self.data += struct.pack('<BB', rotation, x)
+
+    def reset(self, seed):
+        self._record(RESET)
+        self.data += struct.pack('<Q', seed)
+
+    def ticked(self, frames):
+        self.frame += frames
+        if self.frame >= self.next_checksum:
+            self.next_checksum = self.frame + self.checksum_interval
+            self._record(CHECKSUM)
+            self.data += struct.pack('<I', self.state.checksum())
+
+    def to_bytes(self):
+        name = self.ruleset.encode('ascii')
+        header = MAGIC + struct.pack('<BB', VERSION, len(name)) + name
+        header += struct.pack('<QH', self.seed, self.checksum_interval)
+        tail = bytearray()
+        write_varint(tail, self.frame - self.last_frame)
+        tail.append(END)
+        tail += struct.pack('<II', self.state.checksum(), self.state.score & 0xFFFFFFFF)
+        return header + bytes(self.data) + bytes(tail)
+
+    @classmethod
+    def from_argv(cls, argv, state, ruleset):
+        """命令行带 --record=文件 时开始录制，否则返回 None"""
+        for arg in argv:
+            if arg.startswith('--record='):
+                return cls(state, ruleset, path=arg.split('=', 1)[1])
+        return None
+
+    def save(self, path=None):
+        path = path or self.path
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+        print(f'录像已保存到 {path}')
+
+
+def parse_header(data):
+    if data[:4] != MAGIC:
+        raise ValueError('不是录像文件')
+    version, length = struct.unpack_from('<BB', data, 4)
+    if version != VERSION:
+        raise ValueError(f'不支持的录像版本: {version}')
+    ruleset = data[6:6 + length].decode('ascii')
+    seed, interval = struct.unpack_from('<QH', data, 6 + length)
+    return ruleset, seed, interval, 6 + length + 10
+
+
+def play(data, verify=True):
+    """全速回放录像，返回 (结束时的 GameState, 总帧数)；校验失败时抛出 ReplayDivergence"""
+    ruleset, seed, _, pos = parse_header(data)
+    state = new_game(ruleset, seed)
+    frame = 0
+    while True:
+        delta, pos = read_varint(data, pos)
+        if delta:
+            state.tick(delta)
+            frame += delta
+        code = data[pos]
+        pos += 1
+        if code < len(ACTIONS):
+            state.step(ACTIONS[code])
+        elif code == PLACE:
+            rotation, x = struct.unpack_from('<BB', data, pos)
+            pos += 2
+            state.place(rotation, x)
+        elif code == RESET:
+            (new_seed,) = struct.unpack_from('<Q', data, pos)
+            pos += 8
+            state.reset(new_seed)
+        elif code == CHECKSUM or code == END:
+            (expected,) = struct.unpack_from('<I', data, pos)
+            pos += 4
+            if verify and expected != state.checksum():
+                raise ReplayDivergence(frame, expected, state.checksum())
+            if code == END:
+                return state, frame
+        else:
+            raise ValueError(f'未知的录像记录类型: {code}')
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def main(argv):
+    if not argv:
+        print('用法: python -m engine.replay 录像文件 [--repeat N]')
+        return 2
+    repeat = 1
+    if '--repeat' in argv:
+        repeat = int(argv[argv.index('--repeat') + 1])
+    data = load(argv[0])
+    start = time.perf_counter()
+    for _ in range(repeat):
+        state, frames = play(data)
+    elapsed = time.perf_counter() - start
+    print(f'规则 {parse_header(data)[0]}, {frames} 帧, 分数 {state.score}, '
+          f'消行 {state.lines}, 方块 {state.pieces_placed}')
+    frames *= repeat
+    print(f'回放 {repeat} 次用时 {elapsed:.3f} 秒, {frames / elapsed:,.0f} 帧/秒 '
+          f'({frames / elapsed / 60:,.0f} 倍速)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,37 @@
+"""游戏规则常量，前端和无界面模拟共用"""
+
+COLUMNS = 10
+ROWS = 20
+
+# 七种方块的形状
+SHAPES = [
+    [[1, 1, 1, 1]],  # I
+    [[1, 0, 0], [1, 1, 1]],  # J
+    [[0, 0, 1], [1, 1, 1]],  # L
+    [[1, 1], [1, 1]],        # O
+    [[0, 1, 1], [1, 1, 0]],  # S
+    [[0, 1, 0], [1, 1, 1]],  # T
+    [[1, 1, 0], [0, 1, 1]]   # Z
+]
+
+# 行消除与得分
+SCORES = [0, 100, 300, 600, 1000]  # 消除0~4行的得分
+
+# csdn/main.py 版本的规则：方块顺序不同，每行 100 分，旋转带墙踢，分数越高下落越快
+CSDN_SHAPES = [
+    [[1, 1, 1, 1]],       # I
+    [[1, 1], [1, 1]],     # O
+    [[1, 1, 1], [0, 1, 0]], # T
+    [[1, 1, 1], [1, 0, 0]], # L
+    [[1, 1, 1], [0, 0, 1]], # J
+    [[1, 1, 0], [0, 1, 1]], # S
+    [[0, 1, 1], [1, 1, 0]]  # Z
+]
+CSDN_SCORES = [0, 100, 200, 300, 400]
+CSDN_KICKS = ((0, 0), (-1, 0), (1, 0), (0, -1), (-2, 0), (2, 0))
+
+
+def csdn_gravity_frames(score, fps=60):
+    """自动下落的间隔帧数，从 500 毫秒随分数逐渐缩短到 50 毫秒"""
+    fall_speed = max(50, 500 - score // 10)
+    return max(1, fall_speed * fps // 1000)
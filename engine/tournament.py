@@ -0,0 +1,204 @@
+"""多进程自动玩家锦标赛：大量带种子的无界面对局，汇总分数和吞吐量
+
+对局按 (权重配置, 种子) 分成若干批交给 ProcessPoolExecutor，默认每个核一个进程。
+进程启动时建好各配置的 Bot 和搜索缓存，之后的对局一直复用；
+每批结束后把每局的 (分数, 消行, 方块数, 耗时) 送回主进程，边跑边显示进度。
+所有配置使用同一组种子，两个配置之间比较的是逐局配对的差值。
+
+命令行：
+    python -m engine.tournament [--games N] [--seed S] [--workers N] [--batch N]
+                                [--max-pieces N] [--weights 名称=JSON ...]
+                                [--json 结果.json] [--baseline 旧结果.json]
+
+--weights 可以给多次，JSON 里只需写要改的权重，例如 --weights deep='{"holes": -0.5}'；
+不给时只跑默认权重。--baseline 读入以前 --json 保存的结果，按同名配置和种子配对比较，
+用来检查引擎改动对分数的影响。
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine.bot import Bot, play_game
+from engine.cache import LRUCache
+
+Z_95 = 1.96         # 95% 置信区间，局数很多时按正态近似
+BATCH = 32          # 每批的对局数，太小时进程通信占比高，太大时进度和负载不均
+CACHE_SIZE = 1 << 16
+
+# 工作进程里的 {配置名: Bot}，由 _init_worker 建立，跨批复用
+_BOTS = {}
+
+
+def _init_worker(configs):
+    _BOTS.clear()
+    for name, weights in configs.items():
+        _BOTS[name] = Bot(weights, cache=LRUCache(CACHE_SIZE))
+
+
+def run_batch(tasks, max_pieces=None):
+    """在当前进程里跑一批 (配置名, 种子)，返回每局的结果字典"""
+    results = []
+    for name, seed in tasks:
+        start = time.perf_counter()
+        state = play_game(seed, max_pieces=max_pieces, bot=_BOTS[name])
+        results.append({
+            'config': name,
+            'seed': seed,
+            'score': state.score,
+            'lines': state.lines,
+            'pieces': state.pieces_placed,
+            'time': time.perf_counter() - start,
+        })
+    return results
+
+
+def mean_ci(values):
+    """(平均值, 95% 置信区间半宽)"""
+    n = len(values)
+    if not n:
+        return 0.0, 0.0
+    mean = sum(values) / n
+    if n < 2:
+        return mean, float('inf')
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, Z_95 * math.sqrt(variance / n)
+
+
+def batches(configs, seeds, size=BATCH):
+    """按种子切批，同一批里包含所有配置，各配置的进度保持一致"""
+    tasks = [(name, seed) for seed in seeds for name in configs]
+    step = size * len(configs)
+    return [tasks[i:i + step] for i in range(0, len(tasks), step)]
+
+
+class Tournament:
+    """configs 是 {配置名: 权重字典或 None}"""
+
+    def __init__(self, configs=None, games=1000, seed=0, workers=None, batch=BATCH, max_pieces=None):
+        self.configs = configs or {'default': None}
+        self.seeds = range(seed, seed + games)
+        self.workers = os.cpu_count() if workers is None else workers
+        self.batch = batch
+        self.max_pieces = max_pieces
+        self.results = []
+        self.elapsed = 0.0
+
+    def run(self, progress=None):
+        """跑完全部对局，每批结果回来时调用 progress(已完成局数, 总局数)"""
+        work = batches(self.configs, self.seeds, self.batch)
+        total = sum(len(tasks) for tasks in work)
+        self.results = []
+        start = time.perf_counter()
+        if self.workers == 0:
+            # 不开进程，方便调试和 cProfile
+            _init_worker(self.configs)
+            for tasks in work:
+                self._collect(run_batch(tasks, self.max_pieces), total, progress)
+        else:
+            with ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                     initargs=(self.configs,)) as pool:
+                futures = [pool.submit(run_batch, tasks, self.max_pieces) for tasks in work]
+                for future in as_completed(futures):
+                    self._collect(future.result(), total, progress)
+        self.elapsed = time.perf_counter() - start
+        self.results.sort(key=lambda r: (r['seed'], r['config']))
+        return self.results
+
+    def _collect(self, results, total, progress):
+        self.results.extend(results)
+        if progress:
+            progress(len(self.results), total)
+
+    def summary(self):
+        """{配置名: {指标: (平均值, 置信区间半宽)}}"""
+        table = {}
+        for name in self.configs:
+            rows = [r for r in self.results if r['config'] == name]
+            table[name] = {key: mean_ci([r[key] for r in rows]) for key in ('score', 'lines', 'pieces', 'time')}
+        return table
+
+    def throughput(self):
+        """(局/秒, 方块/秒)，按墙钟时间算"""
+        if not self.elapsed:
+            return 0.0, 0.0
+        pieces = sum(r['pieces'] for r in self.results)
+        return len(self.results) / self.elapsed, pieces / self.elapsed
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump({'configs': self.configs, 'elapsed': self.elapsed, 'workers': self.workers,
+                       'games': self.results}, f)
+
+
+def paired_diff(results, baseline, config, other_config=None, key='score'):
+    """同一种子两组结果之差的 (平均值, 置信区间半宽, 配对局数)"""
+    before = {r['seed']: r[key] for r in baseline if r['config'] == (other_config or config)}
+    diffs = [r[key] - before[r['seed']] for r in results if r['config'] == config and r['seed'] in before]
+    return mean_ci(diffs) + (len(diffs),)
+
+
+def parse_weights(args):
+    configs = {}
+    for arg in args:
+        name, _, text = arg.partition('=')
+        configs[name] = json.loads(text) if text else None
+    return configs
+
+
+def _progress(done, total):
+    print(f'\r{done}/{total} 局', end='', file=sys.stderr, flush=True)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m engine.tournament', description='多进程自动玩家锦标赛')
+    parser.add_argument('--games', type=int, default=1000, help='每个配置的局数（默认 1000）')
+    parser.add_argument('--seed', type=int, default=0, help='第一局的种子')
+    parser.add_argument('--workers', type=int, help='进程数，默认每个核一个，0 表示不开进程')
+    parser.add_argument('--batch', type=int, default=BATCH, help=f'每批的对局数（默认 {BATCH}）')
+    parser.add_argument('--max-pieces', type=int, help='每局最多放的方块数')
+    parser.add_argument('--weights', action='append', default=[], metavar='名称=JSON',
+                        help='一个权重配置，可以给多次；JSON 里只写要改的权重')
+    parser.add_argument('--json', dest='json_path', help='把逐局结果写到 JSON 文件')
+    parser.add_argument('--baseline', help='和之前 --json 保存的结果按配置和种子配对比较')
+    args = parser.parse_args(argv)
+
+    tournament = Tournament(parse_weights(args.weights), games=args.games, seed=args.seed,
+                            workers=args.workers, batch=args.batch, max_pieces=args.max_pieces)
+    tournament.run(_progress)
+    print(file=sys.stderr)
+
+    games_per_sec, pieces_per_sec = tournament.throughput()
+    print(f'{len(tournament.results)} 局，{tournament.workers or 1} 个进程，用时 {tournament.elapsed:.1f} 秒，'
+          f'{games_per_sec:,.1f} 局/秒，{pieces_per_sec:,.0f} 方块/秒')
+    # 中文标题每个字占两列宽
+    print(f'{"配置":<10}{"分数":>18}{"消行":>14}{"方块":>14}{"毫秒/局":>7}')
+    for name, stats in tournament.summary().items():
+        cells = [f'{stats[key][0]:,.0f} ± {stats[key][1]:,.0f}' for key in ('score', 'lines', 'pieces')]
+        print(f'{name:<12}{cells[0]:>20}{cells[1]:>16}{cells[2]:>16}{stats["time"][0] * 1000:>10.1f}')
+
+    names = list(tournament.configs)
+    for name in names[1:]:
+        mean, ci, n = paired_diff(tournament.results, tournament.results, name, names[0])
+        print(f'{name} - {names[0]}: 分数差 {mean:+,.0f} ± {ci:,.0f}（{n} 局配对）')
+    baseline_path = args.baseline
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)['games']
+        for name in names:
+            mean, ci, n = paired_diff(tournament.results, baseline, name)
+            if n:
+                print(f'{name} 对比 {baseline_path}: 分数差 {mean:+,.0f} ± {ci:,.0f}（{n} 局配对）')
+    json_path = args.json_path
+    if json_path:
+        tournament.save(json_path)
+        print(f'逐局结果已保存到 {json_path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
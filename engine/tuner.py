@@ -0,0 +1,227 @@
+"""自动玩家权重调优：交叉熵方法（CEM），候选在多个进程里并行评估
+
+每一代从高斯分布采样一批权重向量（长度归一化，打分只和方向有关），
+所有候选在同一组种子（相同的方块序列）上对局，分数可以逐局配对比较。
+种子分成几段依次评估，每段结束后把每个候选和当前领先者配对比较，
+分数差的 95% 置信区间整个落在 0 以下就提前淘汰，不再跑剩下的种子。
+按平均分取最好的一部分候选更新分布的均值和标准差（跑完全部种子的排在被淘汰的前面，
+不够数时用被淘汰的补齐），上一代最好的权重直接进入下一代。
+
+已经评估过的 (权重, 种子, 方块上限) 追加写入磁盘缓存，中断后用同样的参数重跑，
+采样序列相同，已经跑过的对局直接读缓存。
+
+命令行：
+    python -m engine.tuner [--generations G] [--population N] [--elite N] [--games N]
+                           [--stage N] [--max-pieces N] [--workers N] [--seed S]
+                           [--cache 文件]
+
+结束时打印的 JSON 可以直接交给 python -m engine.tournament --weights 名称=JSON 验证。
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.bot import DEFAULT_WEIGHTS, FEATURES, Bot, play_game
+from engine.tournament import mean_ci
+
+DEFAULT_CACHE = 'tuner_cache.jsonl'
+MIN_STD = 0.02      # 标准差下限，避免分布过早收缩到一点
+DIGITS = 4          # 权重保留的小数位，同时决定缓存键
+MIN_PAIRED = 8      # 至少配对这么多局才考虑提前淘汰，局数太少时正态近似不可靠
+
+
+def normalize(vector):
+    """缩放到单位长度并取整，返回元组"""
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return tuple(round(v / norm, DIGITS) for v in vector)
+
+
+def as_weights(vector):
+    return dict(zip(FEATURES, vector))
+
+
+def evaluate(vector, seeds, max_pieces):
+    """在工作进程里用一组权重跑完 seeds，返回每局分数"""
+    bot = Bot(as_weights(vector))
+    return [play_game(seed, max_pieces=max_pieces, bot=bot).score for seed in seeds]
+
+
+class ScoreCache:
+    """(权重, 种子, 方块上限) -> 分数，每条结果一行 JSON，只追加不改写"""
+
+    def __init__(self, path=DEFAULT_CACHE):
+        self.path = path
+        self.scores = {}
+        self.hits = 0
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        item = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 中断时写了一半的最后一行
+                        continue
+                    self.scores[tuple(item['weights']), item['seed'], item['max_pieces']] = item['score']
+
+    def get(self, vector, seed, max_pieces):
+        score = self.scores.get((vector, seed, max_pieces))
+        if score is not None:
+            self.hits += 1
+        return score
+
+    def put(self, vector, seeds, max_pieces, scores):
+        lines = []
+        for seed, score in zip(seeds, scores):
+            self.scores[vector, seed, max_pieces] = score
+            lines.append(json.dumps({'weights': vector, 'seed': seed, 'max_pieces': max_pieces, 'score': score}))
+        if self.path and lines:
+            with open(self.path, 'a') as f:
+                f.write('\n'.join(lines) + '\n')
+
+
+def paired_worse(scores, leader):
+    """scores 相对 leader 逐局配对的分数差，置信区间上界小于 0 时返回 True"""
+    diffs = [score - leader[seed] for seed, score in scores.items() if seed in leader]
+    if len(diffs) < MIN_PAIRED:
+        return False
+    mean, ci = mean_ci(diffs)
+    return mean + ci < 0
+
+
+class CrossEntropyTuner:
+    def __init__(self, population=16, elite=4, games=32, stage=8, max_pieces=500, workers=None,
+                 seed=0, cache=None, initial=None):
+        self.population = population
+        self.elite = elite
+        self.seeds = list(range(seed, seed + games))
+        self.stage = stage
+        self.max_pieces = max_pieces
+        self.workers = os.cpu_count() if workers is None else workers
+        self.rng = random.Random(seed)
+        self.cache = cache if cache is not None else ScoreCache(None)
+        self.mean = list(normalize(initial or [DEFAULT_WEIGHTS[name] for name in FEATURES]))
+        self.std = [0.3] * len(FEATURES)
+        self.best = None            # (权重, 平均分)
+        self.games_played = 0
+        self.stopped = 0
+
+    def sample(self):
+        candidates = [normalize([self.rng.gauss(m, s) for m, s in zip(self.mean, self.std)])
+                      for _ in range(self.population)]
+        if self.best is not None:
+            candidates[0] = self.best[0]
+        return candidates
+
+    def _run(self, pool, jobs):
+        """jobs 是 [(候选下标, 权重, 种子列表)]，返回 {下标: {种子: 分数}}"""
+        results = {}
+        pending = []
+        for index, vector, seeds in jobs:
+            scores = results.setdefault(index, {})
+            missing = []
+            for seed in seeds:
+                score = self.cache.get(vector, seed, self.max_pieces)
+                if score is None:
+                    missing.append(seed)
+                else:
+                    scores[seed] = score
+            if missing:
+                if pool is None:
+                    pending.append((index, vector, missing, evaluate(vector, missing, self.max_pieces)))
+                else:
+                    pending.append((index, vector, missing, pool.submit(evaluate, vector, missing, self.max_pieces)))
+        for index, vector, seeds, future in pending:
+            scores = future if pool is None else future.result()
+            self.cache.put(vector, seeds, self.max_pieces, scores)
+            results[index].update(zip(seeds, scores))
+            self.games_played += len(seeds)
+        return results
+
+    def generation(self, pool=None):
+        """评估一代候选并更新分布，返回 ([(权重, 平均分)], 跑完全部种子的候选数)，按排名先后排列"""
+        candidates = self.sample()
+        scores = {index: {} for index in range(len(candidates))}
+        alive = set(scores)
+        for start in range(0, len(self.seeds), self.stage):
+            chunk = self.seeds[start:start + self.stage]
+            done = self._run(pool, [(index, candidates[index], chunk) for index in sorted(alive)])
+            for index, result in done.items():
+                scores[index].update(result)
+            means = {index: sum(scores[index].values()) / len(scores[index]) for index in alive}
+            leader = max(means, key=means.get)
+            for index in list(alive):
+                if index != leader and paired_worse(scores[index], scores[leader]):
+                    alive.discard(index)
+                    self.stopped += 1
+        means = {index: sum(result.values()) / len(result) for index, result in scores.items()}
+        order = sorted(scores, key=lambda index: (index not in alive, -means[index]))
+        ranked = [(candidates[index], means[index]) for index in order]
+        elite = [vector for vector, _ in ranked[:self.elite]]
+        for i in range(len(self.mean)):
+            values = [vector[i] for vector in elite]
+            self.mean[i] = sum(values) / len(values)
+            spread = math.sqrt(sum((v - self.mean[i]) ** 2 for v in values) / len(values))
+            self.std[i] = max(spread, MIN_STD)
+        self.mean = list(normalize(self.mean))
+        # 种子固定，上一代最好的候选分数不变，只会被更好的替换
+        if self.best is None or ranked[0][1] >= self.best[1]:
+            self.best = ranked[0]
+        return ranked, len(alive)
+
+    def run(self, generations, report=None):
+        """跑 generations 代，每代结束调用 report(代数, 排名, 跑完的候选数)"""
+        pool = ProcessPoolExecutor(self.workers) if self.workers else None
+        try:
+            for index in range(generations):
+                ranked, finished = self.generation(pool)
+                if report:
+                    report(index, ranked, finished)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return self.best
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m engine.tuner', description='交叉熵方法调优自动玩家权重')
+    parser.add_argument('--generations', type=int, default=10, help='代数（默认 10）')
+    parser.add_argument('--population', type=int, default=16, help='每代候选数（默认 16）')
+    parser.add_argument('--elite', type=int, default=4, help='用来更新分布的最好候选数（默认 4）')
+    parser.add_argument('--games', type=int, default=32, help='每个候选的对局数（默认 32）')
+    parser.add_argument('--stage', type=int, default=8, help='每段评估的局数，段之间提前淘汰（默认 8）')
+    parser.add_argument('--max-pieces', type=int, default=500, help='每局最多放的方块数（默认 500）')
+    parser.add_argument('--workers', type=int, help='进程数，默认每个核一个，0 表示不开进程')
+    parser.add_argument('--seed', type=int, default=0, help='第一局的种子，同时决定采样序列')
+    parser.add_argument('--cache', default=DEFAULT_CACHE, help=f'分数缓存文件（默认 {DEFAULT_CACHE}）')
+    args = parser.parse_args(argv)
+
+    cache = ScoreCache(args.cache)
+    resumed = len(cache.scores)
+    tuner = CrossEntropyTuner(population=args.population, elite=args.elite, games=args.games, stage=args.stage,
+                              max_pieces=args.max_pieces, workers=args.workers, seed=args.seed, cache=cache)
+    if resumed:
+        print(f'缓存中已有 {resumed} 局结果')
+    start = time.perf_counter()
+
+    def report(index, ranked, finished):
+        best_vector, best_score = tuner.best
+        elapsed = time.perf_counter() - start
+        print(f'第 {index + 1} 代: 跑完 {finished}/{tuner.population} 个候选，本代最好 {ranked[0][1]:,.0f}，'
+              f'历史最好 {best_score:,.0f}；累计对局 {tuner.games_played}，缓存命中 {cache.hits}，'
+              f'提前淘汰 {tuner.stopped}，用时 {elapsed:.1f} 秒')
+        print('    均值', ' '.join(f'{name}={value:+.3f}' for name, value in zip(FEATURES, tuner.mean)))
+
+    best_vector, best_score = tuner.run(args.generations, report)
+    print(f'最好权重（平均分 {best_score:,.0f}）:')
+    print(json.dumps(as_weights(best_vector)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
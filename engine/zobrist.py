@@ -0,0 +1,37 @@
+"""Zobrist 哈希：每个格子一个 64 位随机数，棋盘哈希是所有已占格子随机数的异或
+
+按行预先算好 keys[y][mask]，一行的贡献只需查一次表，固定方块时
+只更新方块所在的几行，消行时只重算被移动的行。
+"""
+
+import random
+from functools import lru_cache
+
+from engine.rules import COLUMNS, ROWS
+
+SEED = 0x7E7215
+
+
+@lru_cache(maxsize=None)
+def row_keys(columns=COLUMNS, rows=ROWS):
+    """keys[y][mask]：第 y 行占用情况为 mask 时对哈希的贡献"""
+    rng = random.Random(SEED)
+    table = []
+    for _ in range(rows):
+        cells = [rng.getrandbits(64) for _ in range(columns)]
+        keys = [0] * (1 << columns)
+        for mask in range(1, 1 << columns):
+            low = mask & -mask
+            keys[mask] = keys[mask ^ low] ^ cells[low.bit_length() - 1]
+        table.append(keys)
+    return tuple(table)
+
+
+def board_hash(rows, keys=None):
+    """从头计算行掩码列表的哈希"""
+    keys = keys or row_keys(COLUMNS, len(rows))
+    result = 0
+    for y, mask in enumerate(rows):
+        if mask:
+            result ^= keys[y][mask]
+    return result
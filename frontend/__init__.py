@@ -0,0 +1 @@
+"""两个 pygame 前端共用的组件"""
@@ -0,0 +1,103 @@
+"""延迟加载的音效管理
+
+构造时不碰声卡。第一帧画出之后调用 start()，后台线程再初始化混音器、
+开始流式播放背景音乐（pygame.mixer.music 边读边解码，不会整首解码到内存），
+然后逐个解码音效。还没解码好的音效调用 play() 时直接忽略。
+"""
+
+import threading
+
+from frontend.startup import STARTUP, lazy_import
+
+pygame = lazy_import('pygame')
+
+
+class AudioManager:
+    """files 是 {音效名: 文件路径或返回 Sound 的函数}，music 是背景音乐路径
+
+    给出 cache（frontend.pcm_cache.PCMCache）时，文件先查解码缓存。
+    banks 是一组带 load() 方法的音效库（如 frontend.synth.SoundBank），
+    load() 返回 {键: Sound}，整批加入。
+    """
+
+    def __init__(self, files=None, volume=None, music=None, music_volume=0.3, cache=None, banks=()):
+        self.files = files or {}
+        self.cache = cache
+        self.banks = banks
+        self.volume = volume
+        self.music = music
+        self.music_volume = music_volume
+        self.sounds = {}
+        self.thread = None
+        self.closing = False
+
+    @property
+    def started(self):
+        return self.thread is not None
+
+    def start(self):
+        """在后台线程加载，立即返回"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._load, name='audio-loader', daemon=True)
+            self.thread.start()
+        return self
+
+    def _load(self):
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print('音效加载失败:', e)
+            return
+        STARTUP.mark('mixer_ready')
+        if self.music:
+            try:
+                pygame.mixer.music.load(self.music)
+                pygame.mixer.music.set_volume(self.music_volume)
+                pygame.mixer.music.play(-1)  # -1表示循环播放
+                STARTUP.mark('music_started')
+            except pygame.error as e:
+                print('背景音乐加载失败:', e)
+        for name, source in self.files.items():
+            if self.closing:
+                return
+            try:
+                sound = self._load_sound(source)
+            except (pygame.error, OSError) as e:
+                print(f'音效 {name} 加载失败:', e)
+                continue
+            if self.volume is not None:
+                sound.set_volume(self.volume)
+            # 字典赋值是原子的，主线程随时可以读
+            self.sounds[name] = sound
+        for bank in self.banks:
+            if self.closing:
+                return
+            try:
+                sounds = bank.load()
+            except pygame.error as e:
+                print('音效生成失败:', e)
+                continue
+            for name, sound in sounds.items():
+                if self.volume is not None:
+                    sound.set_volume(self.volume)
+                self.sounds[name] = sound
+        STARTUP.mark('sounds_ready')
+
+    def _load_sound(self, source):
+        if callable(source):
+            return source()
+        if self.cache is not None:
+            return self.cache.load(source)
+        return pygame.mixer.Sound(source)
+
+    def play(self, name):
+        """播放音效，未加载完或加载失败时什么也不做"""
+        sound = self.sounds.get(name)
+        if sound is not None:
+            sound.play()
+
+    def close(self):
+        """退出前调用，等后台线程结束，避免 pygame.quit() 时还在解码"""
+        self.closing = True
+        if self.thread is not None:
+            self.thread.join()
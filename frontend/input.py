@@ -0,0 +1,98 @@
+"""按键自动重复（DAS/ARR）调度
+
+按下时立即执行一次动作，按住超过 das 秒后每隔 arr 秒重复一次。
+重复时刻按单调时钟从按下的时间戳精确推算，不依赖帧率：
+每个绘制帧处理完按键事件后调用一次 due()，取出上一帧以来到期的全部重复动作，按到期时间排序后依次执行，
+帧率高低或者某一帧卡顿都不会多走或少走。
+
+pygame 的事件不带时间戳，按键事件的时间记为取出事件队列的时刻。
+每个动作从输入时刻（按下或重复到期）到画面提交的延迟都会记录下来，
+命令行带 --input-stats 时退出前打印 p50/p95/p99。
+
+命令行参数：
+    --das=毫秒    首次重复前的延迟（默认 200）
+    --arr=毫秒    之后的重复间隔（默认 50）
+"""
+
+import atexit
+import time
+from collections import deque
+
+from frontend.profiler import percentile
+
+
+class KeyRepeat:
+    """actions 是 {按键: 动作}，只有其中的按键会自动重复"""
+
+    def __init__(self, actions, das=0.2, arr=0.05, clock=time.perf_counter, stats=False, window=600):
+        self.actions = actions
+        self.das = das
+        self.arr = arr
+        self.clock = clock
+        self.held = {}          # 按键 -> 下一次重复的时刻
+        self.pending = []       # 已执行、还没显示到屏幕上的动作的输入时刻
+        self.latencies = deque(maxlen=window)
+        if stats:
+            atexit.register(self.report)
+
+    @classmethod
+    def from_argv(cls, argv, actions):
+        kwargs = {}
+        for arg in argv:
+            if arg.startswith('--das='):
+                kwargs['das'] = int(arg.split('=', 1)[1]) / 1000
+            elif arg.startswith('--arr='):
+                kwargs['arr'] = int(arg.split('=', 1)[1]) / 1000
+        return cls(actions, stats='--input-stats' in argv, **kwargs)
+
+    def press(self, key, now=None):
+        """按键按下，返回要立即执行的动作，不需要重复的按键返回 None"""
+        action = self.actions.get(key)
+        if action is not None:
+            now = self.clock() if now is None else now
+            self.held[key] = now + self.das
+            self.pending.append(now)
+        return action
+
+    def release(self, key):
+        self.held.pop(key, None)
+
+    def release_all(self):
+        """窗口失去焦点时调用，收不到松开事件的按键不再重复"""
+        self.held.clear()
+
+    def due(self, now=None):
+        """返回上一次调用以来到期的 [(到期时刻, 动作)]，按时间先后排列"""
+        now = self.clock() if now is None else now
+        fired = []
+        for key, when in self.held.items():
+            action = self.actions[key]
+            while when <= now:
+                fired.append((when, action))
+                when += self.arr
+            self.held[key] = when
+        fired.sort(key=lambda item: item[0])
+        self.pending.extend(when for when, _ in fired)
+        return fired
+
+    def shown(self, now=None):
+        """画面提交后调用，记录这一帧执行的动作从输入到显示的延迟"""
+        if not self.pending:
+            return
+        now = self.clock() if now is None else now
+        for when in self.pending:
+            self.latencies.append((now - when) * 1000)
+        self.pending.clear()
+
+    def summary(self):
+        """(p50, p95, p99) 毫秒，没有数据时返回 None"""
+        if not self.latencies:
+            return None
+        return tuple(percentile(self.latencies, q) for q in (50, 95, 99))
+
+    def report(self):
+        summary = self.summary()
+        if summary is None:
+            return
+        print(f'输入延迟（毫秒，最近 {len(self.latencies)} 次）: '
+              f'p50 {summary[0]:.1f}  p95 {summary[1]:.1f}  p99 {summary[2]:.1f}')
@@ -0,0 +1,111 @@
+"""解码后音频的磁盘缓存
+
+MP3 解码和合成音效都比较慢，第一次加载时把混音器格式的原始 PCM 写到缓存目录，
+以后启动直接 mmap 缓存文件交给 pygame.mixer.Sound(buffer=...)，不再解码也不重写。
+
+缓存文件名是 名称.键.pcm，文件来源的名称带上路径摘要，合成来源的名称由调用方给出。
+键由以下内容求 SHA-1：
+    文件来源    源文件内容 + 混音器格式
+    合成来源    调用方给出的各部分（frontend.synth 用合成模块源码的摘要 + 参数 + 变体）+ 混音器格式
+源文件、生成参数或混音器格式任何一项变化，键就变了，旧文件在写入新文件时删除。
+必须在 pygame.mixer.init() 之后使用。
+"""
+
+import hashlib
+import io
+import mmap
+import os
+import wave
+
+from frontend.startup import lazy_import
+
+pygame = lazy_import('pygame')
+
+VERSION = b'pcm1'
+
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'tetris', 'pcm')
+
+
+def wav_bytes(samples, sample_rate):
+    """单声道 16 位样本（bytes 或支持 tobytes() 的数组）打包成内存中的 WAV"""
+    data = samples if isinstance(samples, (bytes, bytearray)) else samples.tobytes()
+    out = io.BytesIO()
+    with wave.open(out, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(data)
+    out.seek(0)
+    return out
+
+
+class PCMCache:
+    """按内容哈希缓存混音器格式的 PCM"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or default_cache_dir()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, *parts):
+        """由混音器格式和各部分内容算出缓存键"""
+        digest = hashlib.sha1(VERSION)
+        digest.update(repr(pygame.mixer.get_init()).encode())
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else repr(part).encode())
+        return digest.hexdigest()[:16]
+
+    def _path(self, name, key):
+        return os.path.join(self.directory, f'{name}.{key}.pcm')
+
+    def get(self, name, key):
+        """读取缓存，没有时返回 None"""
+        sound = None
+        try:
+            with open(self._path(name, key), 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        # Sound 会复制一份样本，映射用完即可关闭
+                        sound = pygame.mixer.Sound(buffer=data)
+        except FileNotFoundError:
+            pass
+        if sound is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return sound
+
+    def put(self, name, key, sound):
+        """先写临时文件再改名，并删掉同名的旧缓存"""
+        path = self._path(name, key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for old in os.listdir(self.directory):
+                if old.startswith(name + '.') and old.endswith('.pcm'):
+                    os.remove(os.path.join(self.directory, old))
+            tmp = f'{path}.{os.getpid()}.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(sound.get_raw())
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f'音效缓存 {name} 写入失败:', e)
+
+    def _load(self, name, key, make):
+        sound = self.get(name, key)
+        if sound is not None:
+            return sound
+        sound = make()
+        self.put(name, key, sound)
+        return sound
+
+    def load(self, path, name=None):
+        """加载音频文件，源文件内容不变时直接用缓存"""
+        with open(path, 'rb') as f:
+            source = f.read()
+        if name is None:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            name = f'{stem}-{hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]}'
+        return self._load(name, self.key(b'file', source), lambda: pygame.mixer.Sound(file=io.BytesIO(source)))
@@ -0,0 +1,158 @@
+"""帧分段计时：统计每帧各阶段耗时，可在屏幕上显示 p50/p95/p99，退出时导出
+
+用法：
+    with profiler.phase('events'):
+        ...
+    profiler.end_frame()
+
+关闭时 phase() 返回一个共享的空上下文，每个阶段只多一次属性判断。
+命令行参数 --profile 打开计时，--profile-dump=frames.csv（或 .json）在退出时导出每帧数据。
+"""
+
+import atexit
+import csv
+import json
+import time
+from collections import deque
+
+from frontend.resources import FONTS
+from frontend.startup import lazy_import
+
+pygame = lazy_import('pygame')
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def percentile(values, q):
+    """最近邻法求百分位数"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class FrameProfiler:
+    """按阶段记录每帧耗时（毫秒）"""
+
+    OVERLAY_REFRESH = 30   # 每 30 帧刷新一次屏幕上的数字
+
+    def __init__(self, enabled=False, dump_path=None, window=600):
+        self.enabled = enabled
+        self.dump_path = dump_path
+        self.window = window
+        self.samples = {}      # 阶段名 -> 最近 window 帧的耗时
+        self.frames = []       # 需要导出时保留每一帧
+        self.current = {}
+        self.frame_start = None
+        self.overlay = None
+        self.overlay_age = 0
+        if dump_path:
+            atexit.register(self.dump)
+
+    @classmethod
+    def from_argv(cls, argv):
+        dump_path = None
+        for arg in argv:
+            if arg.startswith('--profile-dump='):
+                dump_path = arg.split('=', 1)[1]
+        return cls(enabled='--profile' in argv or dump_path is not None, dump_path=dump_path)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.current = {}
+        self.frame_start = None
+        self.overlay = None
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        return _Phase(self, name)
+
+    def record(self, name, seconds):
+        self.current[name] = self.current.get(name, 0.0) + seconds * 1000
+
+    def end_frame(self):
+        """一帧结束时调用，整帧耗时记为 frame"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.current['frame'] = (now - self.frame_start) * 1000
+        self.frame_start = now
+        for name, ms in self.current.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(ms)
+        if self.dump_path:
+            self.frames.append(self.current)
+        self.current = {}
+
+    def summary(self):
+        """{阶段名: (p50, p95, p99)}"""
+        return {name: tuple(percentile(samples, q) for q in (50, 95, 99))
+                for name, samples in self.samples.items() if samples}
+
+    def dump(self, path=None):
+        """导出每帧数据，按扩展名选择 CSV 或 JSON"""
+        path = path or self.dump_path
+        if not path or not self.frames:
+            return
+        names = sorted({name for frame in self.frames for name in frame})
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump({'phases': names, 'frames': self.frames, 'summary': self.summary()}, f)
+        else:
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['index'] + names)
+                for index, frame in enumerate(self.frames):
+                    writer.writerow([index] + [f'{frame.get(name, 0.0):.4f}' for name in names])
+        print(f'帧耗时已导出到 {path}')
+
+    def draw_overlay(self, screen, rect, color=(255, 255, 255), bg_color=(0, 0, 0)):
+        """在 rect 区域画出各阶段的 p50/p95/p99，返回需要提交的矩形"""
+        if not self.enabled:
+            return None
+        self.overlay_age += 1
+        if self.overlay is None or self.overlay_age >= self.OVERLAY_REFRESH:
+            self.overlay_age = 0
+            self.overlay = pygame.Surface(rect.size)
+            self.overlay.fill(bg_color)
+            lines = ['phase   p50  p95  p99 ms']
+            for name, (p50, p95, p99) in sorted(self.summary().items()):
+                lines.append(f'{name[:10]:<10}{p50:5.1f}{p95:5.1f}{p99:5.1f}')
+            for i, line in enumerate(lines):
+                self.overlay.blit(FONTS.render(line, 14, color, 'monospace', system=True), (4, 4 + i * 14))
+        screen.blit(self.overlay, rect)
+        return rect
+
+
+# 默认的关闭状态计时器
+NO_PROFILER = FrameProfiler()
@@ -0,0 +1,103 @@
+"""脏矩形渲染器：只重绘上一帧以来发生变化的格子
+
+网格线预先画在静态背景上。每帧比较棋盘的行掩码和行对象、当前方块和
+影子的位置，只把变化的行或格子重画一遍，返回需要提交的矩形，
+交给 pygame.display.update(rects)。
+"""
+
+from frontend.sprites import BlockAtlas
+from frontend.startup import lazy_import
+
+pygame = lazy_import('pygame')
+
+
+class PlayfieldRenderer:
+    """棋盘区域的增量渲染器，棋盘颜色平面中的值为方块种类 + 1"""
+
+    def __init__(self, columns, rows, grid_size, colors, bg_color, grid_color, shadow_alpha, origin=(0, 0),
+                 atlas=None):
+        self.columns = columns
+        self.rows = rows
+        self.grid_size = grid_size
+        self.colors = colors
+        self.origin = origin
+        self.rect = pygame.Rect(origin, (columns * grid_size, rows * grid_size))
+
+        # 预先画好背景和网格线
+        self.background = pygame.Surface(self.rect.size)
+        self.background.fill(bg_color)
+        for y in range(rows):
+            for x in range(columns):
+                pygame.draw.rect(self.background, grid_color, (x * grid_size, y * grid_size, grid_size, grid_size), 1)
+
+        self.atlas = atlas or BlockAtlas(colors, grid_size)
+        self.shadow_alpha = shadow_alpha
+        self.invalidate()
+
+    def invalidate(self):
+        """下一帧整块重绘，例如暂停画面盖住棋盘之后"""
+        self.masks = [None] * self.rows
+        self.row_objects = [None] * self.rows
+        self.overlay = {}
+        self.full = True
+
+    def cell_rect(self, x, y):
+        size = self.grid_size
+        return pygame.Rect(self.origin[0] + x * size, self.origin[1] + y * size, size, size)
+
+    def piece_overlay(self, piece, shadow_y):
+        """当前方块和影子占用的格子：(x, y) -> (种类, 是否为影子)"""
+        overlay = {}
+        if piece is None:
+            return overlay
+        for x, y in piece.cells:
+            if shadow_y is not None:
+                overlay[(piece.x + x, shadow_y + y)] = (piece.kind, True)
+        for x, y in piece.cells:
+            overlay[(piece.x + x, piece.y + y)] = (piece.kind, False)
+        return overlay
+
+    def draw_cell(self, screen, board, x, y, overlay):
+        rect = self.cell_rect(x, y)
+        screen.blit(self.background, rect, rect.move(-self.origin[0], -self.origin[1]))
+        value = board[y][x]
+        if value:
+            pygame.draw.rect(screen, self.colors[value - 1], rect)
+        drawn = overlay.get((x, y))
+        if drawn:
+            kind, is_shadow = drawn
+            if is_shadow:
+                screen.blit(self.atlas.shadow(kind, self.shadow_alpha), rect)
+            else:
+                pygame.draw.rect(screen, self.colors[kind], rect)
+        return rect
+
+    def render(self, screen, board, piece=None, shadow_y=None):
+        """画出变化的部分，返回需要提交到屏幕的矩形列表"""
+        overlay = self.piece_overlay(piece, shadow_y)
+        if self.full:
+            dirty_rows = range(self.rows)
+        else:
+            dirty_rows = [y for y in range(self.rows)
+                          if board.masks[y] != self.masks[y] or board.cells[y] is not self.row_objects[y]]
+        dirty_cells = {cell for cell in overlay.keys() | self.overlay.keys()
+                       if overlay.get(cell) != self.overlay.get(cell)}
+
+        rects = []
+        for y in dirty_rows:
+            for x in range(self.columns):
+                self.draw_cell(screen, board, x, y, overlay)
+            self.masks[y] = board.masks[y]
+            self.row_objects[y] = board.cells[y]
+            rects.append(pygame.Rect(self.origin[0], self.origin[1] + y * self.grid_size,
+                                     self.rect.width, self.grid_size))
+        redrawn = set(dirty_rows)
+        for x, y in dirty_cells:
+            if y not in redrawn:
+                rects.append(self.draw_cell(screen, board, x, y, overlay))
+
+        self.overlay = overlay
+        if self.full:
+            self.full = False
+            return [self.rect]
+        return rects
@@ -0,0 +1,45 @@
+"""字体和文字图像缓存
+
+每种 (字体, 字号) 只加载一次，渲染出的文字图像按 (文字, 字号, 颜色) 缓存，
+稳定状态下每帧不再读取字体文件、也不再光栅化字形，只有文字内容变化时才渲染。
+"""
+
+from engine.cache import LRUCache
+from frontend.startup import lazy_import
+
+pygame = lazy_import('pygame')
+
+
+class FontCache:
+    """字体对象和文字图像的缓存"""
+
+    def __init__(self, max_surfaces=256):
+        self.fonts = {}
+        self.surfaces = LRUCache(max_surfaces)
+
+    def font(self, path, size, bold=False, system=False):
+        """path 是字体文件路径，system 为 True 时按系统字体名查找"""
+        key = (path, size, bold, system)
+        font = self.fonts.get(key)
+        if font is None:
+            if system:
+                font = pygame.font.SysFont(path, size, bold=bold)
+            else:
+                font = pygame.font.Font(path, size)
+                if bold:
+                    font.set_bold(True)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, path=None, bold=False, system=False):
+        """渲染一段文字，相同参数直接返回缓存的图像"""
+        key = (text, size, color, path, bold, system)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.font(path, size, bold, system).render(text, True, color)
+            self.surfaces.put(key, surface)
+        return surface
+
+
+# 两个前端共用的缓存
+FONTS = FontCache()
@@ -0,0 +1,46 @@
+"""方块图像图集：每种 (颜色, 透明度, 是否预览) 的方块只生成一次，绘制时直接 blit"""
+
+from frontend.startup import lazy_import
+
+pygame = lazy_import('pygame')
+
+
+class BlockAtlas:
+    """按颜色下标缓存方块图像"""
+
+    def __init__(self, colors, size):
+        self.colors = colors
+        self.size = size
+        self.tiles = {}
+
+    def block(self, color, alpha=255, is_preview=False):
+        """整块透明度的方块，预览方块颜色提亮 50"""
+        key = (color, alpha, is_preview)
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = pygame.Surface((self.size, self.size))
+            tile.set_alpha(alpha)
+            base_color = self.colors[color]
+            if is_preview:
+                base_color = [min(c + 50, 255) for c in base_color]
+            tile.fill(base_color)
+            self.tiles[key] = tile
+        return tile
+
+    def shadow(self, color, alpha):
+        """逐像素透明的影子方块"""
+        key = (color, alpha, 'shadow')
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+            tile.fill(tuple(self.colors[color]) + (alpha,))
+            self.tiles[key] = tile
+        return tile
+
+    def prebuild(self, alphas=(255,), previews=(False, True)):
+        """启动时一次性生成所有组合"""
+        for color in range(len(self.colors)):
+            for alpha in alphas:
+                for is_preview in previews:
+                    self.block(color, alpha, is_preview)
+        return self
@@ -0,0 +1,111 @@
+"""启动耗时打点：记录从导入本模块到各个启动阶段的毫秒数
+
+前端尽早导入本模块，之后在窗口创建、第一帧画出、音效加载完成时调用 mark()。
+命令行带 --startup-report 时退出前打印各阶段耗时，用来比较优化前后的首帧时间。
+
+lazy_import() 让 pygame、numpy 这类重量级依赖等到第一次用到时才真正导入。
+按模块统计导入耗时：python -m frontend.startup 脚本路径 [--top N]
+"""
+
+import atexit
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+
+class StartupTimer:
+    """每个阶段只记录第一次到达的时间，可以在后台线程里调用"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = {}
+        self.lock = threading.Lock()
+
+    def mark(self, name):
+        with self.lock:
+            if name not in self.marks:
+                self.marks[name] = (time.perf_counter() - self.start) * 1000
+
+    def report(self):
+        print('启动耗时（毫秒）:')
+        for name, ms in sorted(self.marks.items(), key=lambda item: item[1]):
+            print(f'  {name:<16}{ms:8.1f}')
+
+
+STARTUP = StartupTimer()
+
+
+def lazy_import(name):
+    """返回一个占位模块，第一次访问属性时才执行真正的导入
+
+    必须在其他代码 import 该模块之前调用；已经导入过的直接返回原模块。
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f'No module named {name!r}', name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+@atexit.register
+def _report():
+    if '--startup-report' in sys.argv:
+        STARTUP.report()
+
+
+def import_times(path):
+    """在子进程里用 -X importtime 导入脚本（不执行 __main__ 部分），返回 [(模块, 层级, 自身微秒, 累计微秒)]
+
+    层级 1 是脚本直接导入的模块。
+    """
+    import subprocess
+
+    code = ('import runpy, sys; sys.path.insert(0, sys.argv[1]); '
+            'runpy.run_path(sys.argv[2], run_name="__import_report__")')
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code, directory, path],
+                          capture_output=True, text=True, env=env, cwd=directory)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    times = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2 + 1
+        times.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return times
+
+
+def main(argv):
+    if not argv:
+        print('用法: python -m frontend.startup 脚本路径 [--top N]')
+        return 2
+    top = int(argv[argv.index('--top') + 1]) if '--top' in argv else 15
+    start = time.perf_counter()
+    times = import_times(argv[0])
+    elapsed = time.perf_counter() - start
+    total = sum(self_us for _, _, self_us, _ in times)
+    print(f'{argv[0]}: 导入 {len(times)} 个模块共 {total / 1000:.1f} 毫秒（子进程总耗时 {elapsed * 1000:.0f} 毫秒）')
+    direct = sorted((item for item in times if item[1] == 1), key=lambda item: -item[3])
+    heaviest = sorted(times, key=lambda item: -item[2])
+    for title, rows in (('直接导入（按累计耗时）', direct), ('单个模块（按自身耗时）', heaviest)):
+        print(f'\n{title}\n{"自身 ms":>9}{"累计 ms":>9}  模块')
+        for name, _, self_us, cumulative_us in rows[:top]:
+            print(f'{self_us / 1000:9.1f}{cumulative_us / 1000:9.1f}  {name}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
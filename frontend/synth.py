@@ -0,0 +1,203 @@
+"""程序合成音效：直接在内存里生成 16 位样本交给混音器，不经过 WAV 文件
+
+同一种音效的所有变体（按等级升调的移动/旋转声、按消除行数变化的和弦）
+放在一个二维数组里一次算完，整套音效只需要几次向量化运算。
+样本通过 pygame.sndarray 直接做成 Sound；可选 PCMCache 把结果缓存到磁盘。
+
+命令行：python -m frontend.synth --export 目录 [--variants]  导出 WAV 文件
+"""
+
+import hashlib
+import os
+import sys
+import time
+import wave
+
+from frontend.pcm_cache import wav_bytes
+from frontend.startup import lazy_import
+
+pygame = lazy_import('pygame')
+# 第一次合成时才导入，通常发生在音效线程里
+np = lazy_import('numpy')
+
+SAMPLE_RATE = 44100  # 采样率
+DURATION = 0.15      # 移动、旋转音效时长（秒）
+VOLUME = 0.3         # 音量
+MAX_LEVEL = 10       # 等级超过后不再升调
+
+# 消除 1~4 行时的和弦（Hz），1 行和原来的消除音效相同
+CLEAR_CHORDS = (
+    (440, 880, 1320),
+    (440, 880, 1320, 1760),
+    (440, 554.37, 659.25, 880, 1320),
+    (440, 554.37, 659.25, 880, 1108.73, 1320),
+)
+
+# 导出和默认播放时使用的变体
+BASE_VARIANTS = {'move': 1, 'rotate': 1, 'clear': 1, 'game_over': 0}
+
+with open(__file__, 'rb') as _source:
+    # 本文件内容变化时磁盘缓存失效
+    SOURCE_DIGEST = hashlib.sha1(_source.read()).digest()
+
+
+def _time(sample_rate, seconds):
+    return np.linspace(0, seconds, int(sample_rate * seconds))
+
+
+def level_pitch(levels):
+    """每升一级高一个半音，返回形状 (levels, 1) 的倍数"""
+    return 2 ** (np.arange(levels)[:, None] / 12)
+
+
+def move_waves(sample_rate, duration, pitch):
+    """短促方波"""
+    t = _time(sample_rate, duration)
+    return np.sign(np.sin(2 * np.pi * 800 * pitch * t))
+
+
+def rotate_waves(sample_rate, duration, pitch):
+    """正弦波滑音"""
+    freq = np.linspace(1200, 800, int(sample_rate * duration)) * pitch
+    return np.sin(2 * np.pi * np.cumsum(freq, axis=1) / sample_rate)
+
+
+def clear_waves(sample_rate, chords=CLEAR_CHORDS):
+    """和弦，每一行一个和弦，音符数不同的用 0 Hz 补齐"""
+    t = _time(sample_rate, 0.4)
+    width = max(len(chord) for chord in chords)
+    freqs = np.array([chord + (0,) * (width - len(chord)) for chord in chords], dtype=float)
+    notes = freqs > 0
+    tones = np.sin(2 * np.pi * freqs[:, :, None] * t) * notes[:, :, None]
+    return tones.sum(axis=1) / notes.sum(axis=1)[:, None]
+
+
+def game_over_waves(sample_rate):
+    """频率逐渐降低、指数衰减的低频脉冲"""
+    t = _time(sample_rate, 1.0)
+    freq = 220 * (1 - t)
+    return (np.sin(2 * np.pi * np.cumsum(freq) / sample_rate) * np.exp(-3 * t))[None, :]
+
+
+def to_int16(waves, volume):
+    return (waves * volume * 32767).astype(np.int16)
+
+
+def synthesize_all(sample_rate=SAMPLE_RATE, duration=DURATION, volume=VOLUME, levels=MAX_LEVEL):
+    """一次生成全部音效和变体，返回 {(名称, 变体): int16 样本}
+
+    move/rotate 的变体是等级 1~levels，clear 的变体是消除行数 1~4，game_over 只有变体 0。
+    """
+    pitch = level_pitch(levels)
+    families = {
+        'move': (1, move_waves(sample_rate, duration, pitch)),
+        'rotate': (1, rotate_waves(sample_rate, duration, pitch)),
+        'clear': (1, clear_waves(sample_rate)),
+        'game_over': (0, game_over_waves(sample_rate)),
+    }
+    result = {}
+    for name, (first, waves) in families.items():
+        for i, samples in enumerate(to_int16(waves, volume)):
+            result[name, first + i] = samples
+    return result
+
+
+def make_sound(samples, sample_rate):
+    """单声道 int16 样本做成 Sound；混音器不是 16 位时交给 SDL 转换"""
+    frequency, size, channels = pygame.mixer.get_init()
+    if size != -16 or frequency != sample_rate:
+        return pygame.mixer.Sound(file=wav_bytes(samples, sample_rate))
+    if channels > 1:
+        samples = np.repeat(samples[:, None], channels, axis=1)
+    return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
+
+class SoundBank:
+    """全部音效变体，第一次 load() 时生成，之后直接复用
+
+    给出 cache（frontend.pcm_cache.PCMCache）时先查磁盘缓存，全部命中就不再合成。
+    """
+
+    def __init__(self, cache=None, prefix='synth', duration=DURATION, volume=VOLUME, levels=MAX_LEVEL):
+        self.cache = cache
+        self.prefix = prefix
+        self.params = {'duration': duration, 'volume': volume, 'levels': levels}
+        self.sounds = None
+
+    def variants(self):
+        levels = self.params['levels']
+        return ([('move', level) for level in range(1, levels + 1)]
+                + [('rotate', level) for level in range(1, levels + 1)]
+                + [('clear', lines) for lines in range(1, len(CLEAR_CHORDS) + 1)]
+                + [('game_over', 0)])
+
+    def _cached(self, keys):
+        sounds = {}
+        for variant, (name, key) in keys.items():
+            sound = self.cache.get(name, key)
+            if sound is None:
+                return None
+            sounds[variant] = sound
+        return sounds
+
+    def load(self):
+        """返回 {(名称, 变体): Sound}，需要在混音器初始化之后调用"""
+        if self.sounds is not None:
+            return self.sounds
+        sample_rate = pygame.mixer.get_init()[0]
+        keys = {}
+        if self.cache is not None:
+            params = sorted(self.params.items())
+            keys = {variant: (f'{self.prefix}-{variant[0]}-{variant[1]}',
+                              self.cache.key(b'synth', SOURCE_DIGEST, params, variant))
+                    for variant in self.variants()}
+            self.sounds = self._cached(keys)
+            if self.sounds is not None:
+                return self.sounds
+        samples = synthesize_all(sample_rate, **self.params)
+        self.sounds = {variant: make_sound(data, sample_rate) for variant, data in samples.items()}
+        for variant, (name, key) in keys.items():
+            self.cache.put(name, key, self.sounds[variant])
+        return self.sounds
+
+
+def write_wav(path, samples, sample_rate=SAMPLE_RATE):
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.tobytes())
+
+
+def export_wav(directory='.', variants=False, sample_rate=SAMPLE_RATE):
+    """导出 WAV 文件：默认只导出 move/rotate/clear/game_over.wav，variants 为 True 时导出全部变体"""
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    for (name, variant), samples in synthesize_all(sample_rate).items():
+        if BASE_VARIANTS[name] == variant:
+            filename = f'{name}.wav'
+        elif variants:
+            filename = f'{name}-{variant}.wav'
+        else:
+            continue
+        write_wav(os.path.join(directory, filename), samples, sample_rate)
+        written.append(filename)
+    return written
+
+
+def main(argv):
+    if '--export' not in argv:
+        start = time.perf_counter()
+        samples = synthesize_all()
+        elapsed = time.perf_counter() - start
+        print(f'合成 {len(samples)} 个音效变体用时 {elapsed * 1000:.1f} 毫秒')
+        print('用法: python -m frontend.synth --export 目录 [--variants]')
+        return 0
+    directory = argv[argv.index('--export') + 1]
+    written = export_wav(directory, variants='--variants' in argv)
+    print(f'音效文件已生成：{", ".join(written)}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,62 @@
+"""固定步长主循环：逻辑帧率和绘制帧率分开
+
+真实经过的时间累积到 accumulator 里，每满 1/rate 秒推进一个逻辑帧，
+一个绘制帧里可以推进零到多个逻辑帧，卡顿的帧不会丢掉下落步数。
+speed 是快进倍数，同一个循环按真实时间的若干倍推进逻辑，用于演示和长时间压力测试。
+alpha 是距下一个逻辑帧的比例，绘制时可用来插值。
+
+命令行参数：
+    --fps=N       绘制帧率上限，0 表示不限制（默认 60）
+    --speed=X     快进倍数（默认 1）
+    --smooth      按 alpha 插值绘制下落中的方块
+"""
+
+import time
+
+from engine.game_state import FPS
+
+
+class FixedTimestep:
+    """把真实时间换算成逻辑帧数"""
+
+    SPEEDS = (1, 10, 100)     # 快进键循环切换的倍数
+    MAX_FRAME_TIME = 0.25     # 单帧最多补 0.25 秒，避免长时间卡住后一次补太多
+
+    def __init__(self, rate=FPS, speed=1, render_fps=60, interpolate=False):
+        self.rate = rate
+        self.step = 1 / rate
+        self.speed = speed
+        self.render_fps = render_fps
+        self.interpolate = interpolate
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.last = None
+
+    @classmethod
+    def from_argv(cls, argv):
+        kwargs = {}
+        for arg in argv:
+            if arg.startswith('--fps='):
+                kwargs['render_fps'] = int(arg.split('=', 1)[1])
+            elif arg.startswith('--speed='):
+                kwargs['speed'] = float(arg.split('=', 1)[1])
+        return cls(interpolate='--smooth' in argv, **kwargs)
+
+    def cycle_speed(self):
+        """在 1x / 10x / 100x 之间切换"""
+        speeds = self.SPEEDS
+        self.speed = speeds[(speeds.index(self.speed) + 1) % len(speeds)] if self.speed in speeds else speeds[0]
+        return self.speed
+
+    def advance(self):
+        """每个绘制帧调用一次，返回这一帧要推进的逻辑帧数"""
+        now = time.perf_counter()
+        if self.last is None:
+            self.last = now
+        elapsed = min(now - self.last, self.MAX_FRAME_TIME)
+        self.last = now
+        self.accumulator += elapsed * self.speed
+        ticks = int(self.accumulator * self.rate)
+        self.accumulator -= ticks * self.step
+        self.alpha = self.accumulator * self.rate
+        return ticks
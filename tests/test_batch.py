@@ -0,0 +1,150 @@
+"""NumPy 批量环境和逐局实现对照：落点、消行、合法动作和顶出重开比对 Board / GameState.place，
+best_moves 比对同样权重的 Bot"""
+
+import random
+
+import numpy as np
+
+from benchmarks.boards import make_board
+from engine.batch import BatchEnv, compact_rows
+from engine.bot import Bot, placements as bot_placements
+from engine.game_state import GameState
+from engine.movegen import canonical_rotations
+from engine.pieces import PIECES, Piece
+from engine.rules import COLUMNS, ROWS
+
+FULL_ROW = (1 << COLUMNS) - 1
+GAMES = 16
+STEPS = 400
+
+
+def _rows(env, i):
+    return [int(mask) for mask in env.rows[i]]
+
+
+def _legal(board, kind):
+    """逐个 (旋转, 列) 用 Board.collides 检查出生行放不放得下"""
+    legal = np.zeros((4, COLUMNS), bool)
+    for rotation, data in enumerate(PIECES[kind]):
+        for x in range(COLUMNS):
+            legal[rotation, x] = not board.collides(data.masks, data.width, x, 0)
+    return legal
+
+
+def _lockstep(seed, choose, steps=STEPS):
+    """BatchEnv 和 GAMES 个 GameState 用同样的方块和动作同步推进
+
+    每步前把批量环境的当前、预览方块交给对应的 GameState，choose(env, legal, rng)
+    给出整批的 (旋转, 列)。每步检查合法动作和得分，产生 (env, 逐局状态, 是否结束, 消行数)。
+    """
+    rng = random.Random(seed)
+    env = BatchEnv(GAMES, seed=seed)
+    states = [GameState(seed=i) for i in range(GAMES)]
+    for _ in range(steps):
+        legal = env.legal_moves()
+        for i, state in enumerate(states):
+            assert (legal[i] == _legal(state.board, int(env.current[i]))).all()
+        rotations, columns = choose(env, legal, rng)
+        results = []
+        for i, state in enumerate(states):
+            state.current = Piece(int(env.current[i]))
+            state.next = Piece(int(env.next[i]))
+            results.append(state.place(int(rotations[i]), int(columns[i])))
+        rewards, dones, cleared = env.step(rotations, columns)
+        for i, state in enumerate(states):
+            assert rewards[i] == results[i].score_delta
+            assert cleared[i] == results[i].lines_cleared
+            assert dones[i] == state.game_over
+        yield env, states, dones, cleared
+        for i in np.flatnonzero(dones):
+            states[i] = GameState(seed=int(i))
+
+
+def _random_legal(env, legal, rng):
+    moves = [rng.choice(np.argwhere(allowed)) for allowed in legal]
+    return np.array([rotation for rotation, _ in moves]), np.array([x for _, x in moves])
+
+
+def _mostly_best(env, legal, rng):
+    # 大部分按 best_moves 走才能经常消行，偶尔随机走一步让棋盘更乱
+    if rng.random() < 0.2:
+        return _random_legal(env, legal, rng)
+    return env.best_moves()
+
+
+def _check_lockstep(choose):
+    """逐步比较棋盘和计分，返回 (总消行数, 结束的对局数)"""
+    total_cleared = finished = 0
+    for env, states, dones, cleared in _lockstep(0, choose):
+        for i, state in enumerate(states):
+            if dones[i]:
+                # 结束的对局已经重开，final_score 记下结束时的分数
+                assert env.final_score[i] == state.score
+                assert _rows(env, i) == [0] * ROWS
+                assert env.score[i] == env.lines[i] == env.pieces_placed[i] == 0
+            else:
+                assert _rows(env, i) == state.board.masks
+                assert env.score[i] == state.score
+                assert env.lines[i] == state.lines
+                assert env.pieces_placed[i] == state.pieces_placed
+        total_cleared += int(cleared.sum())
+        finished += int(dones.sum())
+    return total_cleared, finished
+
+
+def test_random_moves_match_game_state():
+    cleared, finished = _check_lockstep(_random_legal)
+    # 随机走法很快顶出，重开的路径要走很多遍
+    assert finished > 50
+
+
+def test_heuristic_moves_match_game_state():
+    cleared, finished = _check_lockstep(_mostly_best)
+    assert cleared > 200
+    assert finished > 0
+
+
+def _bot_scores(bot, board, kind):
+    """Bot 对每个不同形状的 (旋转, 列) 的估值"""
+    return {(rotation, x): bot.evaluate(child, lines)
+            for rotation, x, _, child, lines in bot_placements(board, kind)}
+
+
+def test_best_moves_match_bot_choice():
+    weights = [None, {'holes': -1.0, 'lines': 0.2}, {'height': -0.1, 'wells': -0.6}]
+    checked = skipped = 0
+    for weight in weights:
+        bot = Bot(weight)
+        for env, _, _, _ in _lockstep(1, _mostly_best, 100):
+            rotations, columns = env.best_moves(weight)
+            for i in range(GAMES):
+                kind = int(env.current[i])
+                board = make_board(_rows(env, i))
+                if min(board.tops) < 4:
+                    # Bot 从棋盘上方落下，批量环境从出生行落下，堆到出生区以后
+                    # 批量环境还能放进悬空部分下面，候选集合不同
+                    skipped += 1
+                    continue
+                scores = _bot_scores(bot, board, kind)
+                best = bot.best_placement(board, kind)
+                canonical = canonical_rotations(PIECES[kind])
+                chosen = canonical[rotations[i]], int(columns[i])
+                # 只比较估值：同分的落点两边可能选得不一样
+                assert abs(scores[chosen] - scores[best[:2]]) < 1e-9
+                checked += 1
+    assert checked > 4 * skipped
+
+
+def test_compact_rows_matches_board_clear():
+    rng = random.Random(2)
+    rows = []
+    for _ in range(500):
+        board_rows = [0] * ROWS
+        for y in range(rng.randrange(ROWS), ROWS):
+            board_rows[y] = FULL_ROW if rng.random() < 0.3 else rng.getrandbits(COLUMNS)
+        rows.append(board_rows)
+    compacted, cleared = compact_rows(np.array(rows, np.uint16))
+    for board_rows, new_rows, count in zip(rows, compacted, cleared):
+        board = make_board(board_rows)
+        assert board.clear_full_rows() == count
+        assert board.masks == [int(mask) for mask in new_rows]
@@ -0,0 +1,154 @@
+"""位棋盘和 tetris_backup.py 里原来的列表网格实现对照
+
+同一个随机种子在两种棋盘上各玩一局：方块落点由列表网格的 valid_move 逐行下移求出，
+两边分别固定、消行，每放一块比较一次。
+"""
+
+import random
+
+import tetris_backup as original
+from engine.bitboard import Board
+from engine.pieces import PIECES
+from engine.rules import COLUMNS, ROWS
+from engine.zobrist import board_hash
+
+SEEDS = range(25)
+PIECES_PER_GAME = 200
+
+
+def _tetromino(kind, rotation, x, y):
+    piece = original.Tetromino(original.SHAPES[kind], kind + 1)
+    for _ in range(rotation):
+        piece.rotate()
+    piece.x = x
+    piece.y = y
+    return piece
+
+
+def _original_drop_y(grid, piece):
+    y = piece.y
+    while original.valid_move(grid, piece, 0, y - piece.y + 1):
+        y += 1
+    return y
+
+
+def _games(seed):
+    """每固定一块产生 (列表网格, Board, 列表网格消除的行数, Board 消除的行数)
+
+    每块在所有旋转和列里取底部落得最低的位置（同样低的随机选一个），这样经常会消行。
+    """
+    rng = random.Random(seed)
+    grid = original.create_grid()
+    board = Board(COLUMNS, ROWS)
+    for _ in range(PIECES_PER_GAME):
+        kind = rng.randrange(len(PIECES))
+        candidates = []
+        for rotation in range(4):
+            data = PIECES[kind][rotation]
+            for x in range(COLUMNS - data.width + 1):
+                piece = _tetromino(kind, rotation, x, 0)
+                if original.valid_move(grid, piece, 0, 0):
+                    piece.y = _original_drop_y(grid, piece)
+                    candidates.append((piece.y + data.height, rng.random(), rotation, piece))
+        if not candidates:
+            return
+        _, _, rotation, piece = max(candidates, key=lambda item: item[:2])
+        data = PIECES[kind][rotation]
+        assert [list(row) for row in data.shape] == piece.shape
+
+        original.lock_tetromino(grid, piece)
+        grid, cleared = original.clear_lines(grid)
+        board.lock(data.masks, piece.x, piece.y, kind + 1)
+        board_cleared = board.clear_full_rows(piece.y, piece.y + data.height)
+        yield grid, board, cleared, board_cleared
+
+
+def _masks(grid):
+    return [sum(1 << x for x, cell in enumerate(row) if cell) for row in grid]
+
+
+def test_lock_and_clear_match_list_grid():
+    total = 0
+    for seed in SEEDS:
+        for grid, board, cleared, board_cleared in _games(seed):
+            assert board_cleared == cleared
+            assert board.masks == _masks(grid)
+            assert [list(row) for row in board.cells] == grid
+            total += cleared
+    # 随机落点也要真正消过行，否则消行的比较没有意义
+    assert total > 100
+
+
+def test_collides_matches_valid_move():
+    rng = random.Random(1)
+    for seed in SEEDS[:10]:
+        for grid, board, _, _ in _games(seed):
+            for _ in range(20):
+                kind = rng.randrange(len(PIECES))
+                rotation = rng.randrange(4)
+                x = rng.randrange(-2, COLUMNS + 1)
+                y = rng.randrange(-2, ROWS + 1)
+                data = PIECES[kind][rotation]
+                piece = _tetromino(kind, rotation, x, y)
+                assert board.collides(data.masks, data.width, x, y) == (not original.valid_move(grid, piece, 0, 0))
+
+
+def _original_tops(grid):
+    return [next((y for y in range(ROWS) if grid[y][x]), ROWS) for x in range(COLUMNS)]
+
+
+def test_tops_follow_locks_and_clears():
+    for seed in SEEDS:
+        for grid, board, _, _ in _games(seed):
+            assert board.tops == _original_tops(grid)
+
+
+def test_drop_y_matches_row_by_row_drop():
+    rng = random.Random(2)
+    for seed in SEEDS[:10]:
+        for grid, board, _, _ in _games(seed):
+            for _ in range(20):
+                kind = rng.randrange(len(PIECES))
+                rotation = rng.randrange(4)
+                data = PIECES[kind][rotation]
+                x = rng.randrange(COLUMNS - data.width + 1)
+                # 包括被移到悬空部分下面的位置
+                y = rng.randrange(ROWS - data.height + 1)
+                piece = _tetromino(kind, rotation, x, y)
+                if original.valid_move(grid, piece, 0, 0):
+                    assert board.drop_y(data, x, y) == _original_drop_y(grid, piece)
+
+
+def test_hash_and_rows_after_partial_clear():
+    for seed in SEEDS:
+        for grid, board, _, _ in _games(seed):
+            assert board.hash == board_hash(board.masks, board.keys)
+            # 行在原地交换，不能有两行共用同一个列表
+            assert len({id(row) for row in board.cells}) == ROWS
+
+
+def test_clear_non_adjacent_rows_under_vertical_i():
+    """竖着的 I 填进一列，4 行里只有一部分被填满，消除的行互不相邻"""
+    rng = random.Random(3)
+    i_kind, vertical = 0, 1
+    data = PIECES[i_kind][vertical]
+    for _ in range(300):
+        well = rng.randrange(COLUMNS)
+        grid = original.create_grid()
+        board = Board(COLUMNS, ROWS)
+        for y in range(ROWS - rng.randrange(4, 12), ROWS):
+            full = rng.random() < 0.5
+            for x in range(COLUMNS):
+                if x != well and (full or rng.random() < 0.7):
+                    grid[y][x] = 1 + x % 7
+                    board.lock((1,), x, y, 1 + x % 7)
+        piece = _tetromino(i_kind, vertical, well, 0)
+        piece.y = _original_drop_y(grid, piece)
+        original.lock_tetromino(grid, piece)
+        grid, cleared = original.clear_lines(grid)
+        board.lock(data.masks, well, piece.y, i_kind + 1)
+        assert board.clear_full_rows(piece.y, piece.y + data.height) == cleared
+        assert board.masks == _masks(grid)
+        assert [list(row) for row in board.cells] == grid
+        assert board.tops == _original_tops(grid)
+        assert board.hash == board_hash(board.masks, board.keys)
@@ -0,0 +1,28 @@
+from engine.bot import Bot
+from engine.cache import LRUCache
+from engine.game_state import new_game
+from engine.pieces import Piece
+from engine.planner import BeamBot
+
+
+def _same_board_both_rulesets(kind):
+    """两套规则的同一个空棋盘上放同一个编号的方块（2 在 tetris 里是 L，在 csdn 里是 T）"""
+    states = [new_game(ruleset, seed=0) for ruleset in ('tetris', 'csdn')]
+    for state in states:
+        state.current = Piece(kind, table=state.pieces)
+        state.next = Piece(kind, table=state.pieces)
+    return states
+
+
+def _check_cache_separates_piece_tables(make_bot):
+    shared = make_bot(LRUCache(64))
+    for state in _same_board_both_rulesets(2):
+        assert shared.choose(state) == make_bot(None).choose(state)
+
+
+def test_bot_cache_key_includes_piece_table():
+    _check_cache_separates_piece_tables(lambda cache: Bot(cache=cache))
+
+
+def test_beam_bot_cache_key_includes_piece_table():
+    _check_cache_separates_piece_tables(lambda cache: BeamBot(cache=cache, budget=None, depth=2))
@@ -0,0 +1,68 @@
+from engine.game_state import HARD_DROP, ROTATE, new_game
+from engine.pieces import Piece
+
+CSDN_T = 2
+
+
+def _csdn_t_on_ledge():
+    """csdn 的 T 在出生位置，第 2 行的 4、5、6 列有格子：原地和左右踢墙都放不下"""
+    state = new_game('csdn', seed=1)
+    for x in (4, 5, 6):
+        state.board.lock((1,), x, 2, 1)
+    state.board.update_tops()
+    state.current = Piece(CSDN_T, table=state.pieces)
+    return state
+
+
+def test_csdn_kick_can_lift_piece_above_the_board():
+    state = _csdn_t_on_ledge()
+    result = state.step(ROTATE)
+    assert result.rotated
+    piece = state.current
+    assert (piece.rotation, piece.x, piece.y) == (1, 4, -1)
+
+
+def test_tetris_rules_keep_pieces_inside_the_board():
+    state = _csdn_t_on_ledge()
+    state.above_top = False
+    state.step(ROTATE)
+    piece = state.current
+    assert (piece.rotation, piece.x, piece.y) == (1, 2, 0)
+
+
+def test_lock_above_the_board_drops_the_hidden_cells():
+    state = _csdn_t_on_ledge()
+    state.step(ROTATE)
+    state.step(HARD_DROP)
+    # 第 2 行挡住，T 就固定在 y=-1，伸出顶部的一格丢掉，剩下 (4, 0)、(5, 0)、(5, 1)
+    assert state.board.masks[:3] == [0b110000, 0b100000, 0b1110000]
+    assert state.pieces_placed == 1
+
+
+def _one_line_short(ruleset):
+    state = new_game(ruleset, seed=3)
+    rows = state.board.rows
+    for x in range(state.board.columns):
+        if x not in (0, 1, 2, 3):
+            state.board.lock((1,), x, rows - 1, 1)
+    state.board.update_tops()
+    # 横放的 I 正好填满最后一行
+    state.current = Piece(0, table=state.pieces)
+    state.current.x = 0
+    return state
+
+
+def test_csdn_hard_drop_clears_without_scoring():
+    state = _one_line_short('csdn')
+    result = state.step(HARD_DROP)
+    assert result.lines_cleared == 1
+    assert result.score_delta == 0
+    assert state.score == 0
+    assert state.lines == 1
+
+
+def test_tetris_hard_drop_scores_cleared_lines():
+    state = _one_line_short('tetris')
+    result = state.step(HARD_DROP)
+    assert result.lines_cleared == 1
+    assert state.score == 100
@@ -0,0 +1,110 @@
+"""按键自动重复：DAS 延迟、ARR 间隔、松开取消，以及不同帧率下产生的动作完全相同
+
+时间都用二进制能精确表示的值（1/4、1/16 秒），到期时刻的比较不受浮点误差影响。
+"""
+
+from frontend.input import KeyRepeat
+
+LEFT_KEY, RIGHT_KEY = 'left_key', 'right_key'
+ACTIONS = {LEFT_KEY: 'left', RIGHT_KEY: 'right'}
+DAS = 0.25
+ARR = 0.0625
+
+
+def _repeat():
+    return KeyRepeat(ACTIONS, das=DAS, arr=ARR, clock=lambda: 0.0)
+
+
+def test_press_acts_at_once_and_waits_for_das():
+    repeat = _repeat()
+    assert repeat.press(LEFT_KEY, 0.0) == 'left'
+    assert repeat.due(DAS - 0.001) == []
+    assert repeat.due(DAS) == [(DAS, 'left')]
+
+
+def test_unmapped_key_does_not_repeat():
+    repeat = _repeat()
+    assert repeat.press('space', 0.0) is None
+    assert repeat.due(10.0) == []
+
+
+def test_arr_repeat_count():
+    repeat = _repeat()
+    repeat.press(LEFT_KEY, 0.0)
+    # 按住 1 秒：0.25、0.3125、……、1.0 共 13 次
+    fired = repeat.due(1.0)
+    assert [when for when, _ in fired] == [DAS + i * ARR for i in range(13)]
+    # 再取一次不会重复产生
+    assert repeat.due(1.0) == []
+    assert repeat.due(1.0 + ARR) == [(1.0 + ARR, 'left')]
+
+
+def test_release_cancels_repeat():
+    repeat = _repeat()
+    repeat.press(LEFT_KEY, 0.0)
+    assert len(repeat.due(0.3)) == 1
+    repeat.release(LEFT_KEY)
+    assert repeat.due(2.0) == []
+    # 松开没有按过的键没有影响
+    repeat.release(RIGHT_KEY)
+
+
+def test_release_all_cancels_every_key():
+    repeat = _repeat()
+    repeat.press(LEFT_KEY, 0.0)
+    repeat.press(RIGHT_KEY, 0.1)
+    repeat.release_all()
+    assert repeat.due(2.0) == []
+
+
+def _play(fps, presses, releases, end):
+    """按 fps 逐帧调用，每帧先处理到时的按下和松开，再取到期的重复，返回全部 (时刻, 动作)
+
+    presses 是 [(时刻, 按键)]，按下时刻按输入的时间戳记录；releases 是 [(时刻, 按键)]，
+    松开没有时间戳，在时刻之后的第一帧处理。
+    """
+    repeat = _repeat()
+    presses = sorted(presses)
+    releases = sorted(releases)
+    actions = []
+    for frame in range(int(end * fps) + 1):
+        now = frame / fps
+        while presses and presses[0][0] <= now:
+            when, key = presses.pop(0)
+            actions.append((when, repeat.press(key, when)))
+        while releases and releases[0][0] <= now:
+            repeat.release(releases.pop(0)[1])
+        actions.extend(repeat.due(now))
+    return actions
+
+
+def test_repeat_due_in_the_release_frame_is_dropped():
+    # 松开和到期的重复在同一帧取出时，先处理松开，不会再多走一格
+    repeat = _repeat()
+    repeat.press(LEFT_KEY, 0.0)
+    repeat.release(LEFT_KEY)
+    assert repeat.due(DAS + 0.01) == []
+
+
+# 松开没有时间戳，记在处理它的那一帧，所以下面松开的时刻都放在两种帧率共有的帧上
+# （1/6 秒的倍数），并且松开前 1/30 秒内没有到期的重复；按下可以在任意时刻
+
+def test_same_actions_at_30_and_144_fps():
+    presses = [(0.01, LEFT_KEY), (1.08, RIGHT_KEY), (1.77, LEFT_KEY)]
+    releases = [(1.0, LEFT_KEY), (1.5, RIGHT_KEY), (2.5, LEFT_KEY)]
+    slow = _play(30, presses, releases, 3.0)
+    fast = _play(144, presses, releases, 3.0)
+    assert slow == fast
+    assert len(slow) == (1 + 12) + (1 + 3) + (1 + 8)
+
+
+def test_overlapping_keys_fire_the_same_repeats_at_30_and_144_fps():
+    # 按下的动作在本帧立即执行，排在同一帧取出的、另一个键更早到期的重复前面，
+    # 所以两个键同时按住时帧内的先后可能不同，到期时刻和次数仍然相同
+    presses = [(0.01, LEFT_KEY), (0.58, RIGHT_KEY), (1.21, LEFT_KEY)]
+    releases = [(1.0, LEFT_KEY), (1.5, RIGHT_KEY), (2.0, LEFT_KEY)]
+    slow = _play(30, presses, releases, 2.5)
+    fast = _play(144, presses, releases, 2.5)
+    assert sorted(slow) == sorted(fast)
+    for key in ACTIONS.values():
+        assert [item for item in slow if item[1] == key] == [item for item in fast if item[1] == key]
@@ -0,0 +1,93 @@
+"""可达落点搜索：路径在 GameState 上回放，落点集合和逐个状态的广度优先搜索对照"""
+
+import random
+
+import pytest
+
+from benchmarks.boards import make_board
+from engine.game_state import HARD_DROP, LEFT, RIGHT, ROTATE, SOFT_DROP, new_game
+from engine.movegen import Reachability, canonical_rotations, reachable_placements
+from engine.rules import COLUMNS, ROWS
+
+FULL_ROW = (1 << COLUMNS) - 1
+
+
+def _states(ruleset, count):
+    """随机高度、带空洞和悬空部分的棋盘，出生位置放得下的局面"""
+    found = []
+    seed = 0
+    while len(found) < count:
+        rng = random.Random(seed)
+        state = new_game(ruleset, seed)
+        seed += 1
+        height = rng.randrange(ROWS - 1)
+        rows = [0] * (ROWS - height)
+        for _ in range(height):
+            mask = rng.getrandbits(COLUMNS) & rng.getrandbits(COLUMNS) | rng.getrandbits(COLUMNS)
+            rows.append(mask if mask != FULL_ROW else FULL_ROW & ~(1 << rng.randrange(COLUMNS)))
+        state.board = make_board(rows)
+        if not state.collides(state.current):
+            found.append(state)
+    return found
+
+
+def _bfs_placements(state):
+    """逐个状态调用 GameState.step 的广度优先搜索，返回 {(规范旋转, 列, 落点行)}"""
+    piece = state.current
+    canonical = canonical_rotations(state.pieces[piece.kind])
+    start = (piece.rotation, piece.x, piece.y)
+    seen = {start}
+    queue = [start]
+    landed = set()
+    for rotation, x, y in queue:
+        for action in (LEFT, RIGHT, ROTATE, SOFT_DROP):
+            state.current = piece.copy()
+            state.current.rotation, state.current.x, state.current.y = rotation, x, y
+            if action == SOFT_DROP and state.collides(state.current, 0, 1):
+                landed.add((canonical[rotation], x, y))
+                continue
+            state.step(action)
+            moved = state.current.rotation, state.current.x, state.current.y
+            if moved not in seen:
+                seen.add(moved)
+                queue.append(moved)
+    state.current = piece
+    return landed
+
+
+@pytest.mark.parametrize('ruleset', ['tetris', 'csdn'])
+def test_placements_match_per_state_bfs(ruleset):
+    for state in _states(ruleset, 150):
+        piece = state.current
+        search = Reachability(state.board, piece.kind, piece.rotation, piece.x, piece.y,
+                              state.pieces, state.kicks, state.above_top)
+        canonical = canonical_rotations(state.pieces[piece.kind])
+        found = [(canonical[r], x, y) for r, x, y in search.placements]
+        assert len(found) == len(set(found))
+        assert set(found) == _bfs_placements(state)
+
+
+@pytest.mark.parametrize('ruleset', ['tetris', 'csdn'])
+def test_paths_replay_to_promised_placement(ruleset):
+    replayed = above = 0
+    for state in _states(ruleset, 150):
+        start = state.current.copy()
+        canonical = canonical_rotations(state.pieces[start.kind])
+        board = state.board.copy()
+        for rotation, x, y, actions in reachable_placements(state):
+            assert actions[-1] == HARD_DROP
+            # 上一次硬降可能已经结束了这一局
+            state.board = board.copy()
+            state.current = start.copy()
+            state.game_over = False
+            for action in actions[:-1]:
+                assert not state.step(action).locked
+            piece = state.current
+            assert (canonical[piece.rotation], piece.x, state.drop_y()) == (canonical[rotation], x, y)
+            assert state.step(HARD_DROP).locked
+            replayed += 1
+            above += y < 0
+    assert replayed > 1000
+    if ruleset == 'csdn':
+        # 踢墙把方块抬出棋盘顶部的落点也要走得到
+        assert above > 0
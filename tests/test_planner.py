@@ -0,0 +1,86 @@
+"""束搜索的时间预算：用假时钟控制每层的耗时，检查逐层加深什么时候停下"""
+
+from benchmarks.boards import board_rows, make_board
+from engine.bot import Bot
+from engine.planner import DEEP_DEPTH, BeamBot
+
+T_KIND = 5
+O_KIND = 3
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _TimedBeamBot(BeamBot):
+    """每层搜索完成后把假时钟拨快 costs[层数 - 1] 秒，记录开始过的层数"""
+
+    def __init__(self, costs=(), **kwargs):
+        self.fake_clock = _FakeClock()
+        super().__init__(clock=self.fake_clock, **kwargs)
+        self.costs = costs
+        self.started = []
+
+    def _root(self, board, kinds, hidden, pieces):
+        depth = len(kinds) + hidden
+        self.started.append(depth)
+        move = super()._root(board, kinds, hidden, pieces)
+        if depth <= len(self.costs):
+            self.fake_clock.now += self.costs[depth - 1]
+        return move
+
+
+def _board():
+    return make_board(board_rows('half_full'))
+
+
+def test_zero_budget_still_returns_depth_one():
+    # 第一层用掉 1 毫秒，第二层一开始搜索就超时，丢弃
+    bot = _TimedBeamBot(costs=(0.001,), budget=0.0, depth=3)
+    best = bot.best_placement(_board(), T_KIND, preview=O_KIND)
+    assert bot.started == [1, 2]
+    assert bot.last_depth == 1
+    # 第一层就是一层搜索的 Bot
+    assert best == Bot().best_placement(_board(), T_KIND)
+
+
+def test_zero_budget_on_a_clock_that_always_moves():
+    # 每读一次时钟就过 1 秒，第一层也不受影响
+    bot = _TimedBeamBot(budget=0.0, depth=3)
+
+    def clock():
+        bot.fake_clock.now += 1.0
+        return bot.fake_clock.now
+
+    bot.clock = clock
+    assert bot.best_placement(_board(), T_KIND, preview=O_KIND) is not None
+    assert bot.last_depth == 1
+
+
+def test_deepening_stops_when_estimate_exceeds_remaining_budget():
+    # 第 3 层估计 0.1 * 0.1 / 0.01 = 1 秒，0.11 秒时只剩 0.89 秒
+    bot = _TimedBeamBot(costs=(0.01, 0.1), budget=1.0, depth=DEEP_DEPTH)
+    bot.best_placement(_board(), T_KIND, preview=O_KIND)
+    assert bot.started == [1, 2]
+    assert bot.last_depth == 2
+
+
+def test_deepening_continues_while_estimate_fits():
+    # 第 3 层估计 0.02 * 0.02 / 0.01 = 0.04 秒，剩余 0.97 秒够用
+    bot = _TimedBeamBot(costs=(0.01, 0.02), budget=1.0, depth=DEEP_DEPTH)
+    bot.best_placement(_board(), T_KIND, preview=O_KIND)
+    assert bot.started == [1, 2, 3]
+    assert bot.last_depth == DEEP_DEPTH
+
+
+def test_no_budget_searches_to_deep_depth():
+    # 时钟每层拨快 1 小时也不影响不限时的搜索
+    bot = _TimedBeamBot(costs=(3600.0, 3600.0, 3600.0), budget=None)
+    assert bot.depth == DEEP_DEPTH
+    bot.best_placement(_board(), T_KIND, preview=O_KIND)
+    assert bot.started == list(range(1, DEEP_DEPTH + 1))
+    assert bot.last_depth == DEEP_DEPTH
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from engine.game_state import ACTIONS, PAUSE, new_game
+from engine.replay import Recorder, ReplayDivergence, play, read_varint, write_varint
+
+
+def _record(ruleset, seed):
+    """随机的动作、落点、重开和长短不一的帧间隔，返回 (录像, 录制结束时的状态, 总帧数)"""
+    rng = random.Random(seed)
+    state = new_game(ruleset, seed)
+    recorder = Recorder(state, ruleset, checksum_interval=7)
+    for _ in range(400):
+        roll = rng.random()
+        if roll < 0.05:
+            # 超过一个、两个字节的 varint 帧差
+            state.tick(rng.choice((200, 20000)))
+        elif roll < 0.5:
+            state.tick(rng.randrange(1, 4))
+        elif roll < 0.6:
+            state.place(rng.randrange(4), rng.randrange(8))
+        elif roll < 0.62 or state.game_over:
+            state.reset(rng.getrandbits(63))
+        else:
+            state.step(rng.choice([action for action in ACTIONS if action != PAUSE]))
+    return recorder.to_bytes(), state, recorder.frame
+
+
+@pytest.mark.parametrize('value', [0, 1, 127, 128, 16383, 16384, 2 ** 40])
+def test_varint_round_trip(value):
+    out = bytearray(b'x')
+    write_varint(out, value)
+    assert read_varint(bytes(out), 1) == (value, len(out))
+
+
+@pytest.mark.parametrize('ruleset', ['tetris', 'csdn'])
+def test_record_play_round_trip(ruleset):
+    for seed in range(5):
+        data, recorded, recorded_frames = _record(ruleset, seed)
+        state, frames = play(data)
+        assert frames == recorded_frames
+        assert state.checksum() == recorded.checksum()
+        assert (state.score, state.lines, state.pieces_placed) == \
+            (recorded.score, recorded.lines, recorded.pieces_placed)
+        assert state.board.masks == recorded.board.masks
+
+
+@pytest.mark.parametrize('ruleset', ['tetris', 'csdn'])
+def test_corrupted_checksum_raises_divergence(ruleset):
+    data, _, _ = _record(ruleset, 0)
+    # 最后 8 字节是 END 记录的最终校验和分数
+    corrupted = bytearray(data)
+    corrupted[-8] ^= 0xFF
+    with pytest.raises(ReplayDivergence) as error:
+        play(bytes(corrupted))
+    assert error.value.expected == error.value.actual ^ 0xFF
+    # 不校验时照常放完
+    play(bytes(corrupted), verify=False)
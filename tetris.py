@@ -1,14 +1,31 @@
+# 最先导入，启动耗时从这里开始计
+from frontend.startup import STARTUP
+
 import pygame
 import sys
 import random
 import os
 
+from engine.bitboard import Board, shape_masks
+from engine.bot import BotDriver
+from engine.game_state import GameState, StepResult, LEFT, RIGHT, ROTATE, HARD_DROP, PAUSE
+from engine.pieces import PIECES, Piece
+from engine.planner import BeamBot
+from engine.replay import Recorder
+from engine.rules import COLUMNS, ROWS
+from frontend.audio import AudioManager
+from frontend.input import KeyRepeat
+from frontend.pcm_cache import PCMCache
+from frontend.profiler import FrameProfiler, NO_PROFILER
+from frontend.renderer import PlayfieldRenderer
+from frontend.resources import FONTS
+from frontend.sprites import BlockAtlas
+from frontend.timestep import FixedTimestep
+
 # 游戏窗口参数
 WINDOW_WIDTH = 400
 WINDOW_HEIGHT = 500
 GRID_SIZE = 25
-COLUMNS = 10
-ROWS = 20
 
 # 优化后的配色方案
 BG_COLOR = (30, 36, 40)         # 深灰蓝，护眼
@@ -33,20 +50,6 @@ COLORS = [
     (255, 120, 180)    # Z型：粉红
 ]
 
-# 七种方块的形状
-SHAPES = [
-    [[1, 1, 1, 1]],  # I
-    [[1, 0, 0], [1, 1, 1]],  # J
-    [[0, 0, 1], [1, 1, 1]],  # L
-    [[1, 1], [1, 1]],        # O
-    [[0, 1, 1], [1, 1, 0]],  # S
-    [[0, 1, 0], [1, 1, 1]],  # T
-    [[1, 1, 0], [0, 1, 1]]   # Z
-]
-
-# 行消除与得分
-SCORES = [0, 100, 300, 600, 1000]  # 消除0~4行的得分
-
 # 音效文件路径
 SOUND_FILES = {
     'rotate': 'sounds/rotate.mp3',
@@ -56,79 +59,72 @@ SOUND_FILES = {
     'land': 'sounds/land.mp3'
 }
 
-# 音效对象
-sounds = {}
+# 音效在第一帧之后由后台线程加载，解码结果缓存在磁盘上；背景音乐流式播放
+AUDIO = AudioManager(SOUND_FILES, volume=0.5, music='sounds/tetris_theme.mp3', cache=PCMCache())
+
+# 方块图像图集，影子方块只生成一次
+ATLAS = BlockAtlas(COLORS, GRID_SIZE)
+
+# 右侧信息面板区域
+PANEL_RECT = pygame.Rect(COLUMNS * GRID_SIZE, 0, WINDOW_WIDTH - COLUMNS * GRID_SIZE, WINDOW_HEIGHT)
+# 帧耗时统计显示在面板下方
+PROFILER_RECT = pygame.Rect(COLUMNS * GRID_SIZE, WINDOW_HEIGHT - 200, WINDOW_WIDTH - COLUMNS * GRID_SIZE, 200)
 
 # 加载自定义字体
 FONT_PATH = os.path.join(os.path.dirname(__file__), 'fonts', 'STHeiti Medium.ttc')
 
+def render_text(text, size, color):
+    """用自定义字体渲染文字，字体和渲染结果都有缓存"""
+    return FONTS.render(text, size, color, FONT_PATH)
+
 def load_sounds():
-    """加载所有音效"""
-    try:
-        pygame.mixer.init()
-        # 加载背景音乐
-        pygame.mixer.music.load('sounds/tetris_theme.mp3')
-        pygame.mixer.music.set_volume(0.3)
-        pygame.mixer.music.play(-1)  # -1表示循环播放
-        print('背景音乐加载成功')
-        
-        # 加载音效
-        for name, file in SOUND_FILES.items():
-            try:
-                sounds[name] = pygame.mixer.Sound(file)
-                sounds[name].set_volume(0.5)  # 设置音效音量
-                print(f'音效 {name} 加载成功')
-            except pygame.error as e:
-                print(f'音效 {name} 加载失败:', e)
-    except Exception as e:
-        print('音效加载失败:', e)
+    """在后台线程加载背景音乐和音效，立即返回"""
+    AUDIO.start()
 
 def play_sound(name):
-    """播放指定音效"""
-    if name in sounds:
-        sounds[name].play()
+    """播放指定音效，还没加载好时忽略"""
+    AUDIO.play(name)
 
 # 方块类
-class Tetromino:
-    def __init__(self, shape, color):
-        self.shape = shape
-        self.color = color
-        self.x = COLUMNS // 2 - len(shape[0]) // 2
-        self.y = 0
+class Tetromino(Piece):
+    __slots__ = ()
 
-    def rotate(self):
-        # 顺时针旋转
-        self.shape = [list(row) for row in zip(*self.shape[::-1])]
+    @property
+    def color(self):
+        return COLORS[self.kind]
 
 # 创建空网格
 def create_grid():
-    return [[None for _ in range(COLUMNS)] for _ in range(ROWS)]
+    return Board(COLUMNS, ROWS)
+
+# 旋转后的形状 -> (行掩码, 宽度)，旋转表里的形状预先放入，其他形状第一次用到时加入
+SHAPE_MASKS = {data.shape: (data.masks, data.width) for rotations in PIECES for data in rotations}
 
-# 检查方块是否可以移动
+# 检查方块是否可以移动，rotated_shape 可以是旋转后的形状，也可以是目标旋转下标
 def valid_move(grid, tetromino, dx, dy, rotated_shape=None):
-    shape = rotated_shape if rotated_shape else tetromino.shape
-    for y, row in enumerate(shape):
-        for x, cell in enumerate(row):
-            if cell:
-                nx = tetromino.x + x + dx
-                ny = tetromino.y + y + dy
-                if nx < 0 or nx >= COLUMNS or ny < 0 or ny >= ROWS:
-                    return False
-                if grid[ny][nx]:
-                    return False
-    return True
+    if rotated_shape is None:
+        data = tetromino.data
+        masks, width = data.masks, data.width
+    elif isinstance(rotated_shape, int):
+        data = tetromino.table[tetromino.kind][rotated_shape]
+        masks, width = data.masks, data.width
+    else:
+        # Piece.shape 本身就是元组的元组，列表形式的形状先转换
+        key = rotated_shape if isinstance(rotated_shape[0], tuple) else tuple(map(tuple, rotated_shape))
+        found = SHAPE_MASKS.get(key)
+        if found is None:
+            found = SHAPE_MASKS[key] = shape_masks(key), len(key[0])
+        masks, width = found
+    return not grid.collides(masks, width, tetromino.x + dx, tetromino.y + dy)
 
 # 将方块固定到网格上
 def lock_tetromino(grid, tetromino):
-    for y, row in enumerate(tetromino.shape):
-        for x, cell in enumerate(row):
-            if cell:
-                grid[tetromino.y + y][tetromino.x + x] = tetromino.color
+    # 颜色平面里记录方块种类 + 1
+    grid.lock(tetromino.masks, tetromino.x, tetromino.y, tetromino.kind + 1)
 
 # 随机生成一个方块
 def get_new_tetromino():
-    idx = random.randint(0, 6)
-    return Tetromino(SHAPES[idx], COLORS[idx])
+    return Tetromino(random.randint(0, 6))
 
 # 绘制网格和方块
 def draw_grid(screen, grid):
@@ -137,182 +133,241 @@ def draw_grid(screen, grid):
             rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
             pygame.draw.rect(screen, GRID_COLOR, rect, 1)
             if grid[y][x]:
-                pygame.draw.rect(screen, grid[y][x], rect)
-
-def draw_tetromino(screen, tetromino):
-    for y, row in enumerate(tetromino.shape):
-        for x, cell in enumerate(row):
-            if cell:
-                rect = pygame.Rect((tetromino.x + x) * GRID_SIZE, (tetromino.y + y) * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                pygame.draw.rect(screen, tetromino.color, rect)
-
-# 行消除与得分
-def clear_lines(grid):
-    cleared = 0
-    new_grid = []
-    for row in grid:
-        if all(row):
-            cleared += 1
-        else:
-            new_grid.append(row)
-    for _ in range(cleared):
-        new_grid.insert(0, [None for _ in range(COLUMNS)])
-    return new_grid, cleared
+                pygame.draw.rect(screen, COLORS[grid[y][x] - 1], rect)
+
+def draw_tetromino(screen, tetromino, offset=0):
+    color = COLORS[tetromino.kind]
+    for x, y in tetromino.cells:
+        rect = pygame.Rect((tetromino.x + x) * GRID_SIZE, (tetromino.y + y) * GRID_SIZE + offset, GRID_SIZE, GRID_SIZE)
+        pygame.draw.rect(screen, color, rect)
+
+# 行消除与得分，给出刚固定的方块时只检查它占据的行
+def clear_lines(grid, tetromino=None):
+    if tetromino is None:
+        cleared = grid.clear_full_rows()
+    else:
+        cleared = grid.clear_full_rows(tetromino.y, tetromino.y + tetromino.height)
+    return grid, cleared
 
 # 在界面上显示分数
 def draw_score(screen, score):
-    font = pygame.font.Font(FONT_PATH, 24)
-    text = font.render(f'分数: {score}', True, SCORE_COLOR)
+    text = render_text(f'分数: {score}', 24, SCORE_COLOR)
     screen.blit(text, (WINDOW_WIDTH - 150, 20))
 
 # 绘制下一块方块预览
 def draw_next(screen, next_tetromino):
-    font = pygame.font.Font(FONT_PATH, 20)
-    text = font.render('下一块:', True, SCORE_COLOR)
+    text = render_text('下一块:', 20, SCORE_COLOR)
     screen.blit(text, (WINDOW_WIDTH - 150, 70))
     preview_rect = pygame.Rect(WINDOW_WIDTH - 130, 95, 4 * GRID_SIZE, 4 * GRID_SIZE)
     pygame.draw.rect(screen, NEXT_BG, preview_rect, border_radius=8)
-    for y, row in enumerate(next_tetromino.shape):
-        for x, cell in enumerate(row):
-            if cell:
-                rect = pygame.Rect(WINDOW_WIDTH - 120 + x * GRID_SIZE, 100 + y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                pygame.draw.rect(screen, next_tetromino.color, rect)
+    color = COLORS[next_tetromino.kind]
+    for x, y in next_tetromino.cells:
+        rect = pygame.Rect(WINDOW_WIDTH - 120 + x * GRID_SIZE, 100 + y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+        pygame.draw.rect(screen, color, rect)
 
 # 游戏结束界面
 def draw_game_over(screen, score):
-    font1 = pygame.font.Font(FONT_PATH, 36)
-    font2 = pygame.font.Font(FONT_PATH, 24)
-    text1 = font1.render('游戏结束', True, GAMEOVER_COLOR)
-    text2 = font2.render(f'最终得分: {score}', True, SCORE_COLOR)
-    text3 = font2.render('按回车键重新开始', True, SCORE_COLOR)
+    text1 = render_text('游戏结束', 36, GAMEOVER_COLOR)
+    text2 = render_text(f'最终得分: {score}', 24, SCORE_COLOR)
+    text3 = render_text('按回车键重新开始', 24, SCORE_COLOR)
     screen.blit(text1, (WINDOW_WIDTH // 2 - 80, WINDOW_HEIGHT // 2 - 60))
     screen.blit(text2, (WINDOW_WIDTH // 2 - 80, WINDOW_HEIGHT // 2 - 20))
     screen.blit(text3, (WINDOW_WIDTH // 2 - 110, WINDOW_HEIGHT // 2 + 20))
 
 # 计算影子落点位置
 def get_shadow_y(grid, tetromino):
-    y = tetromino.y
-    while True:
-        if not valid_move(grid, tetromino, 0, y - tetromino.y + 1):
-            break
-        y += 1
-    return y
+    # 由方块底部轮廓和棋盘天际线直接算出
+    return grid.drop_y(tetromino.data, tetromino.x, tetromino.y)
 
 # 绘制影子方块
 def draw_shadow(screen, grid, tetromino):
     shadow_y = get_shadow_y(grid, tetromino)
-    color = tetromino.color + (SHADOW_ALPHA,)
-    shadow_surface = pygame.Surface((GRID_SIZE, GRID_SIZE), pygame.SRCALPHA)
-    shadow_surface.fill(color)
-    for y, row in enumerate(tetromino.shape):
-        for x, cell in enumerate(row):
-            if cell:
-                rect = pygame.Rect((tetromino.x + x) * GRID_SIZE, (shadow_y + y) * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                screen.blit(shadow_surface, rect)
+    shadow_surface = ATLAS.shadow(tetromino.kind, SHADOW_ALPHA)
+    for x, y in tetromino.cells:
+        rect = pygame.Rect((tetromino.x + x) * GRID_SIZE, (shadow_y + y) * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+        screen.blit(shadow_surface, rect)
+
+# 按键与动作的对应关系
+KEY_ACTIONS = {
+    pygame.K_SPACE: PAUSE,
+    pygame.K_LEFT: LEFT,
+    pygame.K_RIGHT: RIGHT,
+    pygame.K_DOWN: HARD_DROP,  # 快速下落到底部
+    pygame.K_UP: ROTATE,
+}
+# 按住时自动重复的按键
+REPEAT_ACTIONS = {
+    pygame.K_LEFT: LEFT,
+    pygame.K_RIGHT: RIGHT,
+}
+
+def play_result_sounds(result):
+    """根据游戏核心返回的事件播放音效"""
+    if result.moved:
+        play_sound('move')
+    if result.rotated:
+        play_sound('rotate')
+    if result.locked:
+        play_sound('land')
+    if result.lines_cleared > 0:
+        play_sound('clear')
+    if result.game_over:
+        play_sound('game_over')
+
+# 暂停和游戏结束画面
+def draw_overlay(screen, state):
+    if state.paused and not state.game_over:
+        text = render_text('暂停', 36, PAUSE_COLOR)
+        screen.blit(text, (WINDOW_WIDTH // 2 - 50, WINDOW_HEIGHT // 2 - 20))
+    if state.game_over:
+        draw_game_over(screen, state.score)
+
+# 两个逻辑帧之间方块已经下落的像素，用于平滑绘制
+def fall_offset(state, alpha):
+    if state.paused or state.game_over or state.collides(state.current, 0, 1):
+        return 0
+    return int((state.fall_frames + alpha) / state.gravity_frames * GRID_SIZE)
+
+# 整帧重绘，offset 是当前方块的下落插值
+def draw_frame(screen, state, profiler=NO_PROFILER, offset=0):
+    screen.fill(BG_COLOR)
+    with profiler.phase('draw_grid'):
+        draw_grid(screen, state.board)
+    if not state.game_over:
+        with profiler.phase('draw_shadow'):
+            draw_shadow(screen, state.board, state.current)
+        with profiler.phase('draw_tetromino'):
+            draw_tetromino(screen, state.current, offset)
+    with profiler.phase('draw_score'):
+        draw_score(screen, state.score)
+    with profiler.phase('draw_next'):
+        draw_next(screen, state.next)
+    with profiler.phase('draw_overlay'):
+        draw_overlay(screen, state)
+
+# 脏矩形模式：只重绘变化的部分，返回需要提交到屏幕的矩形
+def draw_changes(screen, renderer, state, shown, profiler=NO_PROFILER):
+    overlay = (state.paused, state.game_over)
+    if shown.get('overlay') != overlay:
+        # 暂停、结束画面切换时整块重绘
+        shown['overlay'] = overlay
+        shown['panel'] = None
+        renderer.invalidate()
+    piece = None if state.game_over else state.current
+    with profiler.phase('draw_shadow'):
+        shadow_y = None if piece is None else get_shadow_y(state.board, piece)
+    with profiler.phase('draw_grid'):
+        rects = renderer.render(screen, state.board, piece, shadow_y)
+    panel = (state.score, state.next.kind)
+    if shown.get('panel') != panel:
+        shown['panel'] = panel
+        screen.fill(BG_COLOR, PANEL_RECT)
+        with profiler.phase('draw_score'):
+            draw_score(screen, state.score)
+        with profiler.phase('draw_next'):
+            draw_next(screen, state.next)
+        rects.append(PANEL_RECT)
+    if rects and (state.paused or state.game_over):
+        with profiler.phase('draw_overlay'):
+            draw_overlay(screen, state)
+        rects = [screen.get_rect()]
+    return rects
 
 def main():
-    pygame.init()
+    STARTUP.mark('imports')
+    # 混音器留给音效线程初始化，打开声卡不挡住第一帧
+    pygame.display.init()
+    pygame.font.init()
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption('俄罗斯方块')
+    STARTUP.mark('window')
     clock = pygame.time.Clock()
-    
-    # 加载音效
-    load_sounds()
-    
-    def reset():
-        grid = create_grid()
-        current = get_new_tetromino()
-        next_tetromino = get_new_tetromino()
-        score = 0
-        return grid, current, next_tetromino, score
-
-    grid, current, next_tetromino, score = reset()
-    fall_time = 0
-    fall_speed = 0.5
-    paused = False
-    game_over = False
+
+    state = GameState()
+    # 自动玩家同时考虑预览方块，每次决策限时 8 毫秒
+    bot = BotDriver(BeamBot())
+    # --record=文件 录制本次游戏，可用 python -m engine.replay 回放
+    recorder = Recorder.from_argv(sys.argv, state, 'tetris')
+
+    # 逻辑固定 60 帧/秒，--fps=N 限制绘制帧率（0 不限制），--speed=X 快进，F 键切换快进
+    timestep = FixedTimestep.from_argv(sys.argv)
+    # 左右键按住自动重复，--das=毫秒 --arr=毫秒 调整，--input-stats 退出时打印输入延迟
+    key_repeat = KeyRepeat.from_argv(sys.argv, REPEAT_ACTIONS)
+
+    # 默认只重绘变化的格子，--full-redraw 恢复每帧整屏重绘；--smooth 需要整屏重绘
+    renderer = None
+    if '--full-redraw' not in sys.argv and not timestep.interpolate:
+        renderer = PlayfieldRenderer(COLUMNS, ROWS, GRID_SIZE, COLORS, BG_COLOR, GRID_COLOR, SHADOW_ALPHA,
+                                     atlas=ATLAS)
+    shown = {}
+
+    # --profile 打开帧分段计时，F3 切换
+    profiler = FrameProfiler.from_argv(sys.argv)
 
     running = True
     while running:
-        dt = clock.tick(60) / 1000
-        if not paused and not game_over:
-            fall_time += dt
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    if not game_over:
-                        paused = not paused
-                if not paused and not game_over:
-                    if event.key == pygame.K_LEFT:
-                        if valid_move(grid, current, -1, 0):
-                            current.x -= 1
-                            play_sound('move')
-                    elif event.key == pygame.K_RIGHT:
-                        if valid_move(grid, current, 1, 0):
-                            current.x += 1
-                            play_sound('move')
-                    elif event.key == pygame.K_DOWN:
-                        # 快速下落到底部
-                        while valid_move(grid, current, 0, 1):
-                            current.y += 1
-                        play_sound('land')  # 播放落地音效
-                        lock_tetromino(grid, current)
-                        grid, cleared = clear_lines(grid)
-                        if cleared > 0:
-                            play_sound('clear')
-                        score += SCORES[cleared]
-                        current = next_tetromino
-                        next_tetromino = get_new_tetromino()
-                        if not valid_move(grid, current, 0, 0):
-                            game_over = True
-                            play_sound('game_over')
-                        fall_time = 0  # 重置下落时间
-                    elif event.key == pygame.K_UP:
-                        rotated = [list(row) for row in zip(*current.shape[::-1])]
-                        if valid_move(grid, current, 0, 0, rotated):
-                            current.shape = rotated
-                            play_sound('rotate')
-                if game_over and event.key == pygame.K_RETURN:
-                    grid, current, next_tetromino, score = reset()
-                    fall_time = 0
-                    paused = False
-                    game_over = False
-
-        if not paused and not game_over:
-            if fall_time > fall_speed:
-                if valid_move(grid, current, 0, 1):
-                    current.y += 1
-                else:
-                    lock_tetromino(grid, current)
-                    play_sound('land')
-                    grid, cleared = clear_lines(grid)
-                    if cleared > 0:
-                        play_sound('clear')
-                    score += SCORES[cleared]
-                    current = next_tetromino
-                    next_tetromino = get_new_tetromino()
-                    if not valid_move(grid, current, 0, 0):
-                        game_over = True
-                        play_sound('game_over')
-                fall_time = 0
-
-        screen.fill(BG_COLOR)
-        draw_grid(screen, grid)
-        if not game_over:
-            draw_shadow(screen, grid, current)
-            draw_tetromino(screen, current)
-        draw_score(screen, score)
-        draw_next(screen, next_tetromino)
-        if paused and not game_over:
-            font = pygame.font.Font(FONT_PATH, 36)
-            text = font.render('暂停', True, PAUSE_COLOR)
-            screen.blit(text, (WINDOW_WIDTH // 2 - 50, WINDOW_HEIGHT // 2 - 20))
-        if game_over:
-            draw_game_over(screen, score)
-        pygame.display.flip()
+        clock.tick(timestep.render_fps)
+        with profiler.phase('events'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    key_repeat.press(event.key)
+                    action = KEY_ACTIONS.get(event.key)
+                    if action:
+                        play_result_sounds(state.step(action))
+                    if event.key == pygame.K_b:
+                        bot.toggle()  # 切换自动玩家
+                    if event.key == pygame.K_f:
+                        timestep.cycle_speed()
+                    if event.key == pygame.K_F3:
+                        profiler.toggle()
+                        shown.clear()  # 关掉统计后整屏重绘
+                    if state.game_over and event.key == pygame.K_RETURN:
+                        state.reset()
+                elif event.type == pygame.KEYUP:
+                    key_repeat.release(event.key)
+                elif event.type == pygame.WINDOWFOCUSLOST:
+                    key_repeat.release_all()
+            # 本帧的按下和松开处理完再取到期的自动重复，刚松开的键不会多走一格
+            for _, action in key_repeat.due():
+                play_result_sounds(state.step(action))
+
+        with profiler.phase('logic'):
+            # 本帧累计的事件，音效每个绘制帧最多播放一次
+            events = StepResult()
+            for _ in range(timestep.advance()):
+                result = bot.update(state)
+                if result:
+                    events.merge(result)
+                result = state.tick()
+                bot.notify(result)
+                events.merge(result)
+            play_result_sounds(events)
+
+        if renderer:
+            rects = draw_changes(screen, renderer, state, shown, profiler)
+        else:
+            offset = fall_offset(state, timestep.alpha) if timestep.interpolate else 0
+            draw_frame(screen, state, profiler, offset)
+            rects = None
+        overlay_rect = profiler.draw_overlay(screen, PROFILER_RECT)
+        with profiler.phase('flip'):
+            if not renderer:
+                pygame.display.flip()
+            elif rects or overlay_rect:
+                pygame.display.update(rects + [overlay_rect] if overlay_rect else rects)
+        key_repeat.shown()
+        profiler.end_frame()
+
+        if not AUDIO.started:
+            # 第一帧已经显示，再开始加载音效
+            STARTUP.mark('first_frame')
+            load_sounds()
 
+    AUDIO.close()
+    if recorder:
+        recorder.save()
     pygame.quit()
     sys.exit()
 